@@ -12,6 +12,8 @@ class AppConfig(BaseModel):
     splash_duration: int = 10000
     debug_mode: bool = False  # When True, opens DevTools in production
     saved_messages_dir: str = "saved_messages"
+    pretty_json: bool = False  # Indent saved message files for hand editing
+    max_message_bytes: int = 16 * 1024 * 1024  # Request bodies above this are refused with 413
     msc_storage_path: Optional[str] = None  # None for default (backend/msc_storage)
 
     model_config = ConfigDict(extra="ignore")
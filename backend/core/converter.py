@@ -1,5 +1,5 @@
 from typing import Any
-from backend.core.serialization import deserialize_asn1_data
+from backend.core.serialization import deserialize_asn1_data, strip_hex
 
 def _get_members(type_obj: Any) -> list:
     """Helper to retrieve members from different asn1tools internal structures."""
@@ -92,7 +92,7 @@ def convert_to_python_asn1(data: Any, type_obj: Any) -> Any:
             val = data[0]
         
         if isinstance(val, str):
-            clean_hex = val.replace("0x", "").replace(" ", "").replace("\n", "")
+            clean_hex = strip_hex(val)
             # Handle odd length by padding
             if len(clean_hex) % 2 != 0:
                 clean_hex += "0"
@@ -113,7 +113,7 @@ def convert_to_python_asn1(data: Any, type_obj: Any) -> Any:
             hex_str = data
             
         if isinstance(hex_str, str):
-            clean_hex = hex_str.replace("0x", "").replace(" ", "").replace("\n", "")
+            clean_hex = strip_hex(hex_str)
             if len(clean_hex) % 2 != 0:
                 clean_hex += "0"
             
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Callable, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.core.responses import FastJSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """Reject oversize request bodies under the given path prefixes with 413.
+
+    The check uses the declared Content-Length, so an oversize upload is refused
+    before FastAPI reads or parses any of it. The limit is looked up per request
+    so config changes apply without a restart.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: Tuple[str, ...], max_bytes: Callable[[], int]):
+        self.app = app
+        self.prefixes = prefixes
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.prefixes):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    try:
+                        declared = int(value)
+                    except ValueError:
+                        break
+                    if declared > self.max_bytes():
+                        # Same {"detail": ...} shape as an HTTPException
+                        response = FastJSONResponse({"detail": "Request body too large"}, status_code=413)
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+__all__ = ["BodySizeLimitMiddleware"]
@@ -1,7 +1,7 @@
 import os
+import asyncio
 import glob
 import sys
-import json
 import re
 import threading
 import time
@@ -12,6 +12,7 @@ from typing import Dict, Optional, List, Any, Tuple
 
 from backend.core.asn1_runtime import asn1tools
 from backend.core.config import config_manager
+from backend.core.responses import parse_json
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +39,25 @@ class AsnManager:
         self.compilers: Dict[str, asn1tools.compiler.Specification] = {}
         self.metadata: Dict[str, ProtocolMetadata] = {}
         self.examples: Dict[str, Dict[str, Any]] = {}
+        self._type_names: Dict[str, Tuple[str, ...]] = {}
+        self._sorted_type_names: Dict[str, Tuple[str, ...]] = {}
+        self._file_maps: Dict[str, Dict[str, str]] = {}
+        # Absolute paths of the spec files each loaded compiler was built from
+        self._source_files: Dict[str, Tuple[str, ...]] = {}
+        # Bumped on every (re)load so callers can key caches on compiled state
+        self.generation: int = 0
         self._lock = threading.RLock()
         self._current_paths: List[str] = []
         self._snapshot_state: Dict[str, Tuple[float, int]] = {}
         self._last_snapshot_check: float = 0.0
         self._snapshot_interval: float = 2.0  # seconds
         self._compilation_warnings: List[str] = []  # Track implicit import warnings
-        self.load_protocols()
+        # Debounced reload state (see schedule_reload); only touched from the event loop
+        self._pending_reload: Optional[asyncio.Future] = None
+        self._reload_timer: Optional[asyncio.TimerHandle] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        # Nothing is compiled here: the app's startup hook (or the first accessor)
+        # does the first load, so importing this module stays cheap
         
     def _resolve_specs_paths(self) -> List[str]:
         """Resolve spec directories from config, handling relative/absolute paths."""
@@ -148,6 +161,10 @@ class AsnManager:
         return snapshot
 
     def _ensure_latest_locked(self):
+        if self.generation == 0:
+            # Never loaded yet
+            self._load_protocols_locked()
+            return
         now = time.monotonic()
         if now - self._last_snapshot_check < self._snapshot_interval:
             return
@@ -164,6 +181,11 @@ class AsnManager:
         with self._lock:
             return self._load_protocols_locked()
 
+    def ensure_loaded(self) -> None:
+        """Compile the protocols now if they were never loaded or are out of date."""
+        with self._lock:
+            self._ensure_latest_locked()
+
     def get_last_warnings(self) -> List[str]:
         """Return warnings from the last compilation (e.g., implicit imports)."""
         with self._lock:
@@ -204,6 +226,7 @@ class AsnManager:
         new_compilers = {}
         new_metadata = {}
         new_examples = {}
+        new_source_files = {}
 
         errors = {}
 
@@ -227,7 +250,8 @@ class AsnManager:
                 try:
                     compiler = asn1tools.compile_files([specs_path], codec='per')
                     new_compilers[protocol] = compiler
-                    type_names = sorted(list(compiler.types.keys()))
+                    new_source_files[protocol] = (os.path.abspath(specs_path),)
+                    type_names = sorted(compiler.types)
                     
                     # File-based protocol is never grouped as "bundled" in the same way
                     new_metadata[protocol] = ProtocolMetadata(
@@ -264,7 +288,8 @@ class AsnManager:
                 try:
                     compiler = self._compile_with_warnings(direct_asn_files, codec='per')
                     new_compilers[protocol] = compiler
-                    type_names = sorted(list(compiler.types.keys()))
+                    new_source_files[protocol] = tuple(os.path.abspath(path) for path in direct_asn_files)
+                    type_names = sorted(compiler.types)
                     new_metadata[protocol] = ProtocolMetadata(
                         name=protocol,
                         files=[os.path.basename(path) for path in direct_asn_files],
@@ -277,8 +302,8 @@ class AsnManager:
                     loaded_examples = {}
                     for jf in json_files:
                         try:
-                            with open(jf, 'r') as f:
-                                data = json.load(f)
+                            with open(jf, 'rb') as f:
+                                data = parse_json(f.read())
                                 name = os.path.splitext(os.path.basename(jf))[0]
                                 loaded_examples[name] = data
                         except Exception as e:
@@ -316,7 +341,8 @@ class AsnManager:
                     try:
                         compiler = self._compile_with_warnings(asn_files, codec='per')
                         new_compilers[protocol] = compiler
-                        type_names = sorted(list(compiler.types.keys()))
+                        new_source_files[protocol] = tuple(os.path.abspath(path) for path in asn_files)
+                        type_names = sorted(compiler.types)
                         new_metadata[protocol] = ProtocolMetadata(
                             name=protocol,
                             files=[os.path.relpath(path, specs_dir) for path in asn_files],
@@ -329,8 +355,8 @@ class AsnManager:
                         loaded_examples = {}
                         for jf in json_files:
                             try:
-                                with open(jf, 'r') as f:
-                                    data = json.load(f)
+                                with open(jf, 'rb') as f:
+                                    data = parse_json(f.read())
                                     # Use filename stem as key (e.g. "MyMessage" from "MyMessage.json")
                                     name = os.path.splitext(os.path.basename(jf))[0]
                                     loaded_examples[name] = data
@@ -350,6 +376,8 @@ class AsnManager:
                             logger.warning(f"Retaining previous version of {protocol}")
                             new_compilers[protocol] = self.compilers[protocol]
                             new_metadata[protocol] = self.metadata[protocol]
+                            if protocol in self._source_files:
+                                new_source_files[protocol] = self._source_files[protocol]
                             if protocol in self.examples:
                                 new_examples[protocol] = self.examples[protocol]
                         else:
@@ -365,23 +393,82 @@ class AsnManager:
         self.compilers = new_compilers
         self.metadata = new_metadata
         self.examples = new_examples
+        self._source_files = new_source_files
+        self._type_names = {name: tuple(compiler.types) for name, compiler in new_compilers.items()}
+        self._sorted_type_names = {name: tuple(meta.types) for name, meta in new_metadata.items()}
+        self._file_maps = {}
+        self.generation += 1
         self._current_paths = list(search_paths)
         self._snapshot_state = self._capture_snapshot(self._current_paths)
         self._last_snapshot_check = time.monotonic()
         
         return errors
 
+    def get_generation(self) -> int:
+        """Current load generation, after picking up any on-disk changes."""
+        with self._lock:
+            self._ensure_latest_locked()
+            return self.generation
+
     def get_compiler(self, protocol: str) -> Optional[asn1tools.compiler.Specification]:
         with self._lock:
             self._ensure_latest_locked()
             return self.compilers.get(protocol)
 
+    def get_type_names(self, protocol: str) -> Tuple[str, ...]:
+        """Type names of a compiled protocol in compiler order, cached per load."""
+        with self._lock:
+            self._ensure_latest_locked()
+            return self._type_names.get(protocol, ())
+
+    def get_source_files(self, protocol: str) -> Optional[Tuple[str, ...]]:
+        """Absolute paths of the spec files a protocol was compiled from; None if it is not loaded."""
+        with self._lock:
+            self._ensure_latest_locked()
+            return self._source_files.get(protocol)
+
+    def get_sorted_type_names(self, protocol: str) -> Optional[Tuple[str, ...]]:
+        """Sorted type names of a protocol, cached per load; None if the protocol is unknown."""
+        with self._lock:
+            self._ensure_latest_locked()
+            return self._sorted_type_names.get(protocol)
+
     def reload(self) -> Dict[str, str]:
         with self._lock:
             # Reload config in case it changed
             config_manager.reload()
             return self._load_protocols_locked()
 
+    async def schedule_reload(self, debounce: float = 0.2) -> Dict[str, str]:
+        """
+        Reload once no further reload has been requested for `debounce` seconds.
+
+        Bursts of edits (e.g. editor autosave) share a single recompile; every
+        caller in the burst receives that reload's errors.
+        """
+        loop = asyncio.get_running_loop()
+        future = self._pending_reload
+        if future is None or future.done() or future.get_loop() is not loop:
+            future = self._pending_reload = loop.create_future()
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+        self._reload_timer = loop.call_later(debounce, self._start_scheduled_reload, future)
+        return await asyncio.shield(future)
+
+    def _start_scheduled_reload(self, future: asyncio.Future) -> None:
+        # Edits arriving from here on need a fresh reload, so start a new batch
+        if self._pending_reload is future:
+            self._pending_reload = None
+            self._reload_timer = None
+        # Hold a reference so the task isn't garbage collected mid-reload
+        self._reload_task = future.get_loop().create_task(self._run_scheduled_reload(future))
+
+    async def _run_scheduled_reload(self, future: asyncio.Future) -> None:
+        try:
+            future.set_result(await asyncio.to_thread(self.reload))
+        except Exception as e:
+            future.set_exception(e)
+
     def list_protocols(self) -> List[str]:
         with self._lock:
             self._ensure_latest_locked()
@@ -421,6 +508,26 @@ class AsnManager:
             self._ensure_latest_locked()
             return self._get_protocol_path_locked(protocol)
 
+    def get_file_map(self, protocol: str) -> Optional[Dict[str, str]]:
+        """
+        Maps filename -> absolute path for the files in a protocol's directory.
+
+        Built on first use and dropped on every (re)load; the snapshot watches the
+        directory mtime, so files added on disk also invalidate it. Returns None
+        if the protocol has no directory.
+        """
+        with self._lock:
+            self._ensure_latest_locked()
+            file_map = self._file_maps.get(protocol)
+            if file_map is None:
+                path = self._get_protocol_path_locked(protocol)
+                if path is None:
+                    return None
+                with os.scandir(path) as entries:
+                    file_map = {entry.name: entry.path for entry in sorted(entries, key=lambda e: e.name) if entry.is_file()}
+                self._file_maps[protocol] = file_map
+            return file_map
+
     def scan_definitions(self, protocol: str) -> Dict[str, List[str]]:
         """
         Scans .asn files in the protocol directory and returns a mapping of
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from email.utils import parsedate
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+
+def render_json(content: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode JSON-ready content to bytes, using orjson when it can."""
+    if orjson is not None:
+        # Non-string keys (e.g. integer message indexes) become strings, as with json.dumps
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(content, option=option)
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(content, ensure_ascii=False, indent=2, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def parse_json(raw: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Wrap already-encoded JSON bytes in a response without re-encoding them."""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def is_not_modified(request_headers: Headers, response_headers: Mapping[str, str]) -> bool:
+    """True if the request's If-None-Match / If-Modified-Since allow a 304 for these response headers."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        etag = response_headers.get("etag")
+        if if_none_match.strip() == "*":
+            return True
+        if etag is None:
+            return False
+        etag = etag.removeprefix("W/")
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since and last_modified:
+        since, modified = parsedate(if_modified_since), parsedate(last_modified)
+        return since is not None and modified is not None and since >= modified
+    return False
+
+
+def not_modified_response(response_headers: Mapping[str, str]) -> Response:
+    """Empty 304 carrying the validators of the response it replaces."""
+    headers = {key: response_headers[key] for key in ("etag", "last-modified") if key in response_headers}
+    return Response(status_code=304, headers=headers)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed.
+
+    Handlers that already return JSON-ready data (hex strings instead of bytes)
+    can return this directly to skip FastAPI's jsonable_encoder pass. orjson
+    rejects integers wider than 64 bits, which ASN.1 INTEGERs can be, so
+    render_json falls back to the stdlib encoder for those payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+__all__ = [
+    "FastJSONResponse",
+    "is_not_modified",
+    "json_bytes_response",
+    "not_modified_response",
+    "parse_json",
+    "render_json",
+]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
-CHOICE_META_KEYS = {"value", "$choice", "choice"}
+CHOICE_META_KEYS = frozenset({"value", "$choice", "choice"})
+
+_MISSING = object()
+
+# Deletion table for str.translate: drops all whitespace in one pass
+_HEX_WHITESPACE = str.maketrans("", "", " \t\n\r\v\f")
 
 
 def _extract_choice(data: Dict[str, Any]) -> Tuple[str, Any] | None:
@@ -14,63 +19,174 @@ def _extract_choice(data: Dict[str, Any]) -> Tuple[str, Any] | None:
       - {"value": ..., "<marker>": "name"}
       - {"name": ...} (single-key implicit CHOICE)
     """
-    if "$choice" in data and "value" in data:
-        return data["$choice"], data["value"]
-    if "choice" in data and "value" in data:
-        return data["choice"], data["value"]
-    if "value" in data:
-        extra_keys = [key for key in data.keys() if key not in CHOICE_META_KEYS]
-        if len(extra_keys) == 1:
-            marker_key = extra_keys[0]
-            marker_value = data[marker_key]
-            if isinstance(marker_value, str) and marker_value.strip():
-                return marker_value, data["value"]
+    # Every notation except the implicit one needs "value"; most dicts (SEQUENCEs) stop here
+    value = data.get("value", _MISSING)
+    if value is _MISSING:
+        return None
+    if "$choice" in data:
+        return data["$choice"], value
+    if "choice" in data:
+        return data["choice"], value
+    # With both tag keys absent, a marker notation is exactly {"value", <marker>}
+    if len(data) == 2:
+        for marker_key, marker_value in data.items():
+            if marker_key != "value":
+                if isinstance(marker_value, str) and marker_value.strip():
+                    return marker_value, value
     return None
 
 
+def strip_hex(hex_data: str) -> str:
+    """Remove "0x" prefixes and whitespace from hex text."""
+    if "0x" in hex_data:
+        hex_data = hex_data.replace("0x", "")
+    return hex_data.translate(_HEX_WHITESPACE)
+
+
+def hex_to_bytes(hex_data: str) -> bytes:
+    """
+    Parse user-supplied hex text into bytes, ignoring "0x" prefixes and whitespace.
+
+    Well-formed input goes straight to bytes.fromhex, which already skips
+    whitespace between byte pairs, so no intermediate strings are built.
+    Only input that fromhex rejects is stripped and parsed again.
+    """
+    if "0x" not in hex_data:
+        try:
+            return bytes.fromhex(hex_data)
+        except ValueError:
+            pass
+    return bytes.fromhex(strip_hex(hex_data))
+
+
+# Stack marker for a CHOICE: its entry carries (pair, parent, key), and the
+# converted [name, value] pair is frozen into a tuple when it is popped
+_FREEZE = object()
+
+
+def _needs_deserialize(data: Any) -> bool:
+    """Return True as soon as any node in data would be rewritten by deserialize_asn1_data."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "$hex" in node or _extract_choice(node):
+                return True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            if len(node) == 2 and isinstance(node[0], str) and isinstance(node[1], int) and node[0].startswith("0x"):
+                return True
+            stack.extend(node)
+        elif isinstance(node, str) and node.startswith("0x"):
+            return True
+    return False
+
+
+def _needs_serialize(data: Any) -> bool:
+    """Return True as soon as data contains a tuple or bytes value for serialize_asn1_data to convert."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, (tuple, bytes, bytearray)):
+            return True
+    return False
+
+
 def deserialize_asn1_data(data: Any) -> Any:
     """
-    Recursively convert hex strings/special formats to bytes/tuples expected by asn1tools.
+    Convert hex strings/special formats to bytes/tuples expected by asn1tools.
 
     Formats:
     - Hex Bytes: {"$hex": "deadbeef"} -> b'\\xde\\xad\\xbe\\xef'
     - Choice: {"$choice": "optionName", "value": "optionValue"} -> ('optionName', 'optionValue')
     - Bit String Tuple: ["0xdead", 12] -> (b'\\xde\\xad', 12)
+
+    Walks the tree with an explicit stack, so nesting depth is not bounded by
+    the interpreter recursion limit. Each stack entry is (node, parent, key):
+    the converted node is written to parent[key].
+
+    Payloads with nothing to convert are returned as-is rather than copied.
     """
-    if isinstance(data, dict):
-        if "$hex" in data:
-            return bytes.fromhex(data["$hex"])
-        choice_candidate = _extract_choice(data)
-        if choice_candidate:
-            choice_name, choice_value = choice_candidate
-            return (choice_name, deserialize_asn1_data(choice_value))
-        return {k: deserialize_asn1_data(v) for k, v in data.items()}
-    if isinstance(data, list):
-        if len(data) == 2 and isinstance(data[0], str) and isinstance(data[1], int):
-            if data[0].startswith("0x"):
-                return (bytes.fromhex(data[0].replace("0x", "")), data[1])
-        return [deserialize_asn1_data(v) for v in data]
-    if isinstance(data, str):
-        if data.startswith("0x"):
-            return bytes.fromhex(data.replace("0x", ""))
-    return data
+    if not _needs_deserialize(data):
+        return data
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(data, root, 0)]
+    while stack:
+        node, parent, key = stack.pop()
+        if node is _FREEZE:
+            pair, parent, key = parent
+            parent[key] = tuple(pair)
+        elif isinstance(node, dict):
+            if "$hex" in node:
+                parent[key] = bytes.fromhex(node["$hex"])
+                continue
+            choice_candidate = _extract_choice(node)
+            if choice_candidate:
+                choice_name, choice_value = choice_candidate
+                pair = [choice_name, None]
+                stack.append((_FREEZE, (pair, parent, key), None))
+                stack.append((choice_value, pair, 1))
+                continue
+            # Pre-create keys so output order matches input order regardless of stack order
+            out = dict.fromkeys(node)
+            parent[key] = out
+            for k, v in node.items():
+                stack.append((v, out, k))
+        elif isinstance(node, list):
+            if len(node) == 2 and isinstance(node[0], str) and isinstance(node[1], int):
+                if node[0].startswith("0x"):
+                    parent[key] = (bytes.fromhex(node[0].replace("0x", "")), node[1])
+                    continue
+            out_list = [None] * len(node)
+            parent[key] = out_list
+            for i, v in enumerate(node):
+                stack.append((v, out_list, i))
+        elif isinstance(node, str) and node.startswith("0x"):
+            parent[key] = bytes.fromhex(node.replace("0x", ""))
+        else:
+            parent[key] = node
+    return root[0]
 
 
 def serialize_asn1_data(data: Any) -> Any:
-    """Convert asn1tools decoded data to JSON-serializable format."""
-    if isinstance(data, dict):
-        return {k: serialize_asn1_data(v) for k, v in data.items()}
-    if isinstance(data, tuple):
-        if len(data) == 2:
-            first, second = data
-            if isinstance(first, str):
-                return {"$choice": first, "value": serialize_asn1_data(second)}
-            if isinstance(first, (bytes, bytearray)) and isinstance(second, int):
-                return [f"0x{first.hex()}", second]
-        return [serialize_asn1_data(v) for v in data]
-    if isinstance(data, list):
-        return [serialize_asn1_data(v) for v in data]
-    if isinstance(data, (bytes, bytearray)):
-        return data.hex()
-    return data
+    """
+    Convert asn1tools decoded data to JSON-serializable format.
 
+    Uses the same explicit-stack traversal as deserialize_asn1_data, and
+    likewise returns already-primitive data unchanged.
+    """
+    if not _needs_serialize(data):
+        return data
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(data, root, 0)]
+    while stack:
+        node, parent, key = stack.pop()
+        if isinstance(node, dict):
+            out = dict.fromkeys(node)
+            parent[key] = out
+            for k, v in node.items():
+                stack.append((v, out, k))
+        elif isinstance(node, (tuple, list)):
+            if isinstance(node, tuple) and len(node) == 2:
+                first, second = node
+                if isinstance(first, str):
+                    out = {"$choice": first, "value": None}
+                    parent[key] = out
+                    stack.append((second, out, "value"))
+                    continue
+                if isinstance(first, (bytes, bytearray)) and isinstance(second, int):
+                    parent[key] = [f"0x{first.hex()}", second]
+                    continue
+            out_list = [None] * len(node)
+            parent[key] = out_list
+            for i, v in enumerate(node):
+                stack.append((v, out_list, i))
+        elif isinstance(node, (bytes, bytearray)):
+            parent[key] = node.hex()
+        else:
+            parent[key] = node
+    return root[0]
@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 
 from backend.core.manager import AsnManager
-from backend.core.serialization import serialize_asn1_data
+from backend.core.serialization import serialize_asn1_data, strip_hex
 
 # Context variable used by decode wrappers to forward trace events.
 _collector_ctx: contextvars.ContextVar["TraceCollector | None"] = contextvars.ContextVar(
@@ -195,7 +195,7 @@ class TraceService:
 def _hex_to_bytes(hex_data: str) -> bytes:
     if not isinstance(hex_data, str):
         raise ValueError("hex_data must be a hex string.")
-    clean = hex_data.replace("0x", "").replace(" ", "").replace("\n", "").strip()
+    clean = strip_hex(hex_data)
     if len(clean) == 0 or len(clean) % 2 != 0:
         raise ValueError("hex_data must contain an even number of hex characters.")
     return bytes.fromhex(clean)
@@ -8,7 +8,7 @@ class ValidationType(Enum):
     ERROR = "error"
     WARNING = "warning"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     type: ValidationType
     message: str
@@ -145,6 +145,11 @@ class MscSequence:
         if self.updated_at is None:
             self.updated_at = datetime.now()
     
+    @property
+    def is_empty(self) -> bool:
+        """Business rule: Sequence is empty if it has no messages and no sub-sequences."""
+        return not self.messages and not self.sub_sequences
+    
     def add_message(self, message: MscMessage) -> None:
         """Add message and update tracking."""
         self.messages.append(message)
@@ -1,4 +1,8 @@
-from typing import List, Dict, Any
+import sys
+from collections import Counter, defaultdict
+from functools import partial
+from itertools import pairwise
+from typing import List, Dict, Any, Optional, FrozenSet, Set
 from backend.domain.msc.interfaces import ISequenceValidator, IConfigurationTracker
 from backend.domain.msc.entities import (
     MscSequence, 
@@ -8,6 +12,51 @@ from backend.domain.msc.entities import (
 )
 from backend.core.manager import manager
 
+# Computed result field names are low-cardinality; intern them so results share one string object
+_FIELD_NAME_CACHE: Dict[str, str] = {}
+
+def _data_field_name(field: str) -> str:
+    name = _FIELD_NAME_CACHE.get(field)
+    if name is None:
+        name = _FIELD_NAME_CACHE[field] = sys.intern(f"data.{field}")
+    return name
+
+# (source_actor, target_actor) keys for the RRC direction balance rule
+_UE_TO_GNB = ('UE', 'gNB')
+_GNB_TO_UE = ('gNB', 'UE')
+
+# Rule tables are built once at import rather than on every message
+_VALID_ACTORS = frozenset({'UE', 'gNB', 'Network', 'CoreNetwork'})
+
+# Expected source actor per RRC message type
+_RRC_SOURCE_RULES: Dict[str, Set[str]] = {
+    'RRCConnectionRequest': {'UE'},
+    'RRCConnectionSetup': {'gNB'},
+    'RRCConnectionSetupComplete': {'UE'},
+    'RRCReconfiguration': {'gNB'},
+    'MeasurementReport': {'UE'}
+}
+
+# RRC-specific identifier mapping
+_RRC_IDENTIFIERS: Dict[str, List[str]] = {
+    'RRCConnectionRequest': ['ue-Identity', 'establishmentCause'],
+    'RRCConnectionSetup': ['rrc-TransactionIdentifier'],
+    'RRCConnectionSetupComplete': ['rrc-TransactionIdentifier'],
+    'RRCReconfiguration': ['rrc-TransactionIdentifier'],
+    'RRCConnectionRelease': ['rrc-TransactionIdentifier'],
+    'MeasurementReport': ['measId'],
+    'RRCReestablishmentRequest': ['ue-Identity'],
+    'RRCReestablishment': ['rrc-TransactionIdentifier'],
+    'RRCReestablishmentComplete': ['rrc-TransactionIdentifier'],
+    'SecurityModeCommand': ['rrc-TransactionIdentifier'],
+    'SecurityModeComplete': ['rrc-TransactionIdentifier'],
+    'SecurityModeFailure': ['rrc-TransactionIdentifier'],
+    'UECapabilityEnquiry': ['rrc-TransactionIdentifier'],
+    'UECapabilityInformation': ['rrc-TransactionIdentifier']
+}
+
+_RRC_START_MESSAGES = frozenset({'RRCConnectionRequest', 'RRCReestablishmentRequest'})
+
 class SequenceValidator(ISequenceValidator):
     """Concrete implementation for validating MSC sequences."""
     
@@ -30,13 +79,16 @@ class SequenceValidator(ISequenceValidator):
         results.extend(self._validate_metadata(sequence))
         
         # 2. Validate individual messages
+        # Protocol is constant across the sequence, so resolve its types once
+        compiler = manager.get_compiler(sequence.protocol)
+        known_types = frozenset(compiler.types) if compiler else None
+        validate_standalone = partial(
+            self._validate_message_standalone, protocol=sequence.protocol, known_types=known_types
+        )
+        
         for i, message in enumerate(sequence.messages):
-            message_results = self.validate_message(message, {
-                'sequence_index': i,
-                'sequence_protocol': sequence.protocol,
-                'previous_messages': sequence.messages[:i]
-            })
-            results.extend(message_results)
+            results.extend(validate_standalone(message))
+            results.extend(self._track_and_validate_identifiers(message, i))
         
         # 3. Validate cross-message consistency (identifiers)
         results.extend(self._validate_identifier_consistency(sequence))
@@ -60,9 +112,27 @@ class SequenceValidator(ISequenceValidator):
         results = []
         sequence_index = sequence_context.get('sequence_index', 0)
         protocol = sequence_context.get('sequence_protocol', 'unknown')
+        if 'known_types' in sequence_context:
+            known_types = sequence_context['known_types']
+        else:
+            compiler = manager.get_compiler(protocol)
+            known_types = frozenset(compiler.types) if compiler else None
+        
+        # 1-3. Structure, data and actor validation
+        results.extend(self._validate_message_standalone(message, protocol, known_types))
+        
+        # 4. Track identifiers and validate consistency up to this point
+        results.extend(self._track_and_validate_identifiers(message, sequence_index))
+        
+        return results
+    
+    def _validate_message_standalone(self, message: MscMessage, protocol: str,
+                                     known_types: Optional[FrozenSet[str]]) -> List[ValidationResult]:
+        """Validate a message on its own, without touching identifier tracking state."""
+        results = []
         
         # 1. Basic message structure validation
-        results.extend(self._validate_message_structure(message, protocol))
+        results.extend(self._validate_message_structure(message, protocol, known_types))
         
         # 2. Data validation based on message type
         results.extend(self._validate_message_data(message, protocol))
@@ -70,9 +140,6 @@ class SequenceValidator(ISequenceValidator):
         # 3. Actor validation
         results.extend(self._validate_actors(message))
         
-        # 4. Track identifiers and validate consistency up to this point
-        results.extend(self._track_and_validate_identifiers(message, sequence_index))
-        
         return results
     
     def _validate_metadata(self, sequence: MscSequence) -> List[ValidationResult]:
@@ -88,7 +155,7 @@ class SequenceValidator(ISequenceValidator):
             ))
         
         # Check sequence has at least one message or sub-sequence
-        if not sequence.messages and not sequence.sub_sequences:
+        if sequence.is_empty:
             results.append(ValidationResult(
                 type=ValidationType.WARNING,
                 message="Sequence is empty - consider adding messages",
@@ -105,7 +172,8 @@ class SequenceValidator(ISequenceValidator):
         
         return results
     
-    def _validate_message_structure(self, message: MscMessage, protocol: str) -> List[ValidationResult]:
+    def _validate_message_structure(self, message: MscMessage, protocol: str,
+                                    known_types: Optional[FrozenSet[str]] = None) -> List[ValidationResult]:
         """Validate basic message structure."""
         results = []
         
@@ -119,8 +187,7 @@ class SequenceValidator(ISequenceValidator):
             ))
         
         # Check message type exists in protocol
-        compiler = manager.get_compiler(protocol)
-        if compiler and message.type_name not in compiler.types:
+        if known_types is not None and message.type_name not in known_types:
             results.append(ValidationResult(
                 type=ValidationType.WARNING,
                 message=f"Message type '{message.type_name}' not found in protocol '{protocol}'",
@@ -128,8 +195,7 @@ class SequenceValidator(ISequenceValidator):
             ))
         
         # Check actors are valid (basic validation)
-        valid_actors = {'UE', 'gNB', 'Network', 'CoreNetwork'}
-        if message.source_actor not in valid_actors:
+        if message.source_actor not in _VALID_ACTORS:
             results.append(ValidationResult(
                 type=ValidationType.WARNING,
                 message=f"Unknown source actor '{message.source_actor}'",
@@ -137,7 +203,7 @@ class SequenceValidator(ISequenceValidator):
                 code="UNKNOWN_ACTOR"
             ))
         
-        if message.target_actor not in valid_actors:
+        if message.target_actor not in _VALID_ACTORS:
             results.append(ValidationResult(
                 type=ValidationType.WARNING,
                 message=f"Unknown target actor '{message.target_actor}'",
@@ -223,7 +289,7 @@ class SequenceValidator(ISequenceValidator):
                 results.append(ValidationResult(
                     type=ValidationType.ERROR,
                     message="ue-Identity must be string or structured object",
-                    field=f"data.{field}",
+                    field=_data_field_name(field),
                     code="INVALID_UE_IDENTITY"
                 ))
             
@@ -231,7 +297,7 @@ class SequenceValidator(ISequenceValidator):
                 results.append(ValidationResult(
                     type=ValidationType.ERROR,
                     message="establishmentCause must be string enum value",
-                    field=f"data.{field}",
+                    field=_data_field_name(field),
                     code="INVALID_CAUSE"
                 ))
         
@@ -251,16 +317,8 @@ class SequenceValidator(ISequenceValidator):
             ))
         
         # RRC protocol actor validation
-        rrc_source_rules = {
-            'RRCConnectionRequest': {'UE'},
-            'RRCConnectionSetup': {'gNB'},
-            'RRCConnectionSetupComplete': {'UE'},
-            'RRCReconfiguration': {'gNB'},
-            'MeasurementReport': {'UE'}
-        }
-        
-        if message.type_name in rrc_source_rules:
-            expected_sources = rrc_source_rules[message.type_name]
+        expected_sources = _RRC_SOURCE_RULES.get(message.type_name)
+        if expected_sources is not None:
             if message.source_actor not in expected_sources:
                 results.append(ValidationResult(
                     type=ValidationType.WARNING,
@@ -311,59 +369,37 @@ class SequenceValidator(ISequenceValidator):
     
     def _get_identifiers_for_message_type(self, type_name: str) -> List[str]:
         """Get identifiers that should be tracked for a specific message type."""
-        # RRC-specific identifier mapping
-        rrc_identifiers = {
-            'RRCConnectionRequest': ['ue-Identity', 'establishmentCause'],
-            'RRCConnectionSetup': ['rrc-TransactionIdentifier'],
-            'RRCConnectionSetupComplete': ['rrc-TransactionIdentifier'],
-            'RRCReconfiguration': ['rrc-TransactionIdentifier'],
-            'RRCConnectionRelease': ['rrc-TransactionIdentifier'],
-            'MeasurementReport': ['measId'],
-            'RRCReestablishmentRequest': ['ue-Identity'],
-            'RRCReestablishment': ['rrc-TransactionIdentifier'],
-            'RRCReestablishmentComplete': ['rrc-TransactionIdentifier'],
-            'SecurityModeCommand': ['rrc-TransactionIdentifier'],
-            'SecurityModeComplete': ['rrc-TransactionIdentifier'],
-            'SecurityModeFailure': ['rrc-TransactionIdentifier'],
-            'UECapabilityEnquiry': ['rrc-TransactionIdentifier'],
-            'UECapabilityInformation': ['rrc-TransactionIdentifier']
-        }
-        
-        return rrc_identifiers.get(type_name, [])
+        return _RRC_IDENTIFIERS.get(type_name, [])
     
     def _validate_identifier_consistency(self, sequence: MscSequence) -> List[ValidationResult]:
         """Validate consistency of identifiers across the entire sequence."""
         results = []
         
-        for identifier_name, identifier in sequence.tracked_identifiers.items():
-            if not identifier.is_consistent():
-                conflicts = self.config_tracker.detect_conflicts(identifier_name)
-                for conflict in conflicts:
-                    # Find which messages have conflicting values
-                    value_to_messages = {}
-                    
-                    for msg_idx, msg in enumerate(sequence.messages):
-                        # Check if this message contains the identifier
-                        if identifier_name in msg.data:
-                            value = msg.data[identifier_name]
-                            value_str = str(value)
-                            if value_str not in value_to_messages:
-                                value_to_messages[value_str] = []
-                            value_to_messages[value_str].append(msg_idx)
-                    
-                    # Find conflicting values (more than one group)
-                    conflicting_values = [
-                        (val, indices) for val, indices in value_to_messages.items()
-                        if len(value_to_messages) > 1
-                    ]
-                    
-                    for value, indices in conflicting_values:
-                        results.append(ValidationResult(
-                            type=ValidationType.ERROR,
-                            message=f"Inconsistent '{identifier_name}': value '{value}' used in messages {indices}",
-                            field=identifier_name,
-                            code="IDENTIFIER_CONFLICT"
-                        ))
+        inconsistent_names = [
+            identifier_name for identifier_name, identifier in sequence.tracked_identifiers.items()
+            if not identifier.is_consistent()
+        ]
+        if not inconsistent_names:
+            return results
+        
+        # Build identifier name -> value -> message indices in a single pass over the messages
+        value_index: Dict[str, Dict[str, List[int]]] = {name: defaultdict(list) for name in inconsistent_names}
+        for msg_idx, msg in enumerate(sequence.messages):
+            for identifier_name, value_to_messages in value_index.items():
+                if identifier_name in msg.data:
+                    value_to_messages[str(msg.data[identifier_name])].append(msg_idx)
+        
+        for identifier_name, value_to_messages in value_index.items():
+            # Conflicting only if the identifier takes more than one value
+            if len(value_to_messages) <= 1:
+                continue
+            for value, indices in value_to_messages.items():
+                results.append(ValidationResult(
+                    type=ValidationType.ERROR,
+                    message=f"Inconsistent '{identifier_name}': value '{value}' used in messages {indices}",
+                    field=identifier_name,
+                    code="IDENTIFIER_CONFLICT"
+                ))
         
         return results
     
@@ -372,14 +408,9 @@ class SequenceValidator(ISequenceValidator):
         results = []
         
         # Rule 1: Messages should generally alternate between UE and gNB (RRC is point-to-point)
-        ue_to_gnb_count = 0
-        gnb_to_ue_count = 0
-        
-        for message in sequence.messages:
-            if message.source_actor == 'UE' and message.target_actor == 'gNB':
-                ue_to_gnb_count += 1
-            elif message.source_actor == 'gNB' and message.target_actor == 'UE':
-                gnb_to_ue_count += 1
+        pair_counts = Counter((message.source_actor, message.target_actor) for message in sequence.messages)
+        ue_to_gnb_count = pair_counts[_UE_TO_GNB]
+        gnb_to_ue_count = pair_counts[_GNB_TO_UE]
         
         # In RRC, we expect roughly balanced communication
         total_messages = len(sequence.messages)
@@ -395,20 +426,17 @@ class SequenceValidator(ISequenceValidator):
                 ))
         
         # Rule 2: Check for duplicate consecutive messages of same type
-        for i in range(1, len(sequence.messages)):
-            if (sequence.messages[i].type_name == sequence.messages[i-1].type_name and
-                sequence.messages[i].source_actor == sequence.messages[i-1].source_actor):
-                
+        for i, (prev, cur) in enumerate(pairwise(sequence.messages), start=1):
+            if cur.type_name == prev.type_name and cur.source_actor == prev.source_actor:
                 results.append(ValidationResult(
                     type=ValidationType.WARNING,
-                    message=f"Consecutive identical messages of type '{sequence.messages[i].type_name}' from same actor",
+                    message=f"Consecutive identical messages of type '{cur.type_name}' from same actor",
                     message_index=i,
                     code="DUPLICATE_CONSECUTIVE_MESSAGES"
                 ))
         
         # Rule 3: Basic RRC flow validation
-        rrc_start_messages = ['RRCConnectionRequest', 'RRCReestablishmentRequest']
-        has_start_message = any(msg.type_name in rrc_start_messages for msg in sequence.messages)
+        has_start_message = any(msg.type_name in _RRC_START_MESSAGES for msg in sequence.messages)
         
         if not has_start_message and len(sequence.messages) > 0:
             results.append(ValidationResult(
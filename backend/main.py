@@ -1,21 +1,46 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from backend.routers import asn, config, files, messages, scratchpad, sessions
+from backend.core.config import config_manager
+from backend.core.limits import BodySizeLimitMiddleware
 from backend.core.manager import manager
+from backend.core.responses import FastJSONResponse
 from backend.version import __version__
 
 # New import for MSC router
-from backend.routers.msc import router as msc_router
+from backend.routers.msc import router as msc_router, shutdown_decode_pool
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Load protocols on startup
-    manager.load_protocols()
+    # The first compile of the protocols (and their type lists) happens here, in the
+    # background, so the server accepts connections straight away and startup doesn't
+    # block the event loop. API requests wait for it in _wait_for_warmup; protocols that
+    # are already loaded and current are not recompiled.
+    warmup_task = asyncio.create_task(asyncio.to_thread(manager.ensure_loaded))
+    app.state.warmup_task = warmup_task
     yield
-    # Clean up if needed
+    # Don't leave the compile thread or decode workers running past shutdown. Await
+    # this run's own task: app.state may already hold one from a later startup.
+    await asyncio.gather(warmup_task, return_exceptions=True)
+    shutdown_decode_pool()
 
-app = FastAPI(title="ASN.1 Processor API", version=__version__)
+# Responses default to orjson rendering (with a stdlib fallback) across every router
+app = FastAPI(
+    title="ASN.1 Processor API",
+    version=__version__,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
+
+# Refuse oversize saved-message uploads before their JSON is parsed.
+# Added first so CORS (added last, outermost) also covers the 413 responses
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    prefixes=("/api/messages",),
+    max_bytes=lambda: config_manager.get().max_message_bytes,
+)
 
 # Allow CORS for Frontend
 app.add_middleware(
@@ -26,23 +51,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+async def _wait_for_warmup(request: Request):
+    # Handlers take the manager lock on the event loop, so a request arriving during the
+    # startup compile would stall the whole server until it finished. Wait for it here
+    # instead, off the lock; asyncio.wait neither raises its error nor cancels it.
+    task = getattr(request.app.state, "warmup_task", None)
+    if task is not None and not task.done():
+        await asyncio.wait((task,))
+
+_after_warmup = [Depends(_wait_for_warmup)]
+
 # Existing routers
-app.include_router(asn.router, prefix="/api/asn", tags=["ASN"])
-app.include_router(config.router, prefix="/api/config", tags=["Config"])
-app.include_router(files.router, prefix="/api", tags=["Files"])
-app.include_router(messages.router, prefix="/api/messages", tags=["Messages"])
-app.include_router(scratchpad.router, prefix="/api/scratchpad", tags=["Scratchpad"])
-app.include_router(sessions.router, prefix="/api/sessions", tags=["Sessions"])
+app.include_router(asn.router, prefix="/api/asn", tags=["ASN"], dependencies=_after_warmup)
+app.include_router(config.router, prefix="/api/config", tags=["Config"], dependencies=_after_warmup)
+app.include_router(files.router, prefix="/api", tags=["Files"], dependencies=_after_warmup)
+app.include_router(messages.router, prefix="/api/messages", tags=["Messages"], dependencies=_after_warmup)
+app.include_router(scratchpad.router, prefix="/api/scratchpad", tags=["Scratchpad"], dependencies=_after_warmup)
+app.include_router(sessions.router, prefix="/api/sessions", tags=["Sessions"], dependencies=_after_warmup)
 
 # New MSC router
-app.include_router(msc_router, prefix="/api", tags=["MSC"])
+app.include_router(msc_router, prefix="/api", tags=["MSC"], dependencies=_after_warmup)
+
+def _is_warmed_up() -> bool:
+    task = getattr(app.state, "warmup_task", None)
+    return task is not None and task.done()
 
 @app.get("/health")
 async def health_check():
+    warmed_up = _is_warmed_up()
     return {
         "status": "ok",
         "version": __version__,
-        "protocols_loaded": len(manager.list_protocols())
+        # Listing would wait on the manager lock while the warm-up compiles
+        "protocols_loaded": len(manager.list_protocols()) if warmed_up else 0,
+        "warmed_up": warmed_up
     }
 
 @app.post("/api/shutdown")
@@ -50,7 +92,6 @@ async def shutdown():
     """Gracefully shutdown the backend server."""
     import os
     import signal
-    import asyncio
     
     async def _shutdown():
         await asyncio.sleep(0.5)  # Give time for response to be sent
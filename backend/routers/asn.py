@@ -1,19 +1,27 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import Any, Dict, Optional, List
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple
+import asyncio
+import logging
 import os
 
 from backend.core.asn1_runtime import asn1tools
 
 from backend.core.manager import manager
-from backend.core.serialization import deserialize_asn1_data, serialize_asn1_data
+from backend.core.serialization import deserialize_asn1_data, serialize_asn1_data, hex_to_bytes, strip_hex
 from backend.core.converter import convert_to_python_asn1
 from backend.core.tracer import TraceService
 from backend.core.type_tree import build_type_tree
 from backend.core.codegen import CodegenService
+from backend.core.responses import FastJSONResponse, json_bytes_response, render_json
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 trace_service = TraceService(manager)
 codegen_service = CodegenService(manager)
@@ -53,17 +61,17 @@ async def encode_message(request: EncodeRequest):
         # because the compiler expects bytes for OCTET STRING / BIT STRING.
         # AND convert Dict to Tuple for CHOICE types.
         
-        print(f"[ENCODE] Raw request data: {request.data}", flush=True)
-        
         type_obj = compiler.types.get(request.type_name)
         if type_obj:
             prepared_data = convert_to_python_asn1(request.data, type_obj)
         else:
             prepared_data = deserialize_asn1_data(request.data)
             
-        print(f"[ENCODE] Prepared data: {prepared_data}", flush=True)
+        logger.debug("[ENCODE] Prepared data: %r", prepared_data)
 
-        encoded = compiler.encode(
+        # Encoding is CPU-bound; run it off the event loop so requests proceed concurrently
+        encoded = await asyncio.to_thread(
+            compiler.encode,
             request.type_name, 
             prepared_data, 
             check_constraints=True
@@ -96,13 +104,40 @@ async def encode_message(request: EncodeRequest):
          # Let's keep 500 for unexpected server crashes.
          raise HTTPException(status_code=500, detail=f"Internal Error: {str(e)}")
 
+# Metadata only changes when protocols are (re)loaded, so these bodies are
+# rendered once per manager generation and served as prebuilt JSON bytes.
+
+@lru_cache(maxsize=1)
+def _protocols_json(generation: int) -> bytes:
+    return render_json(manager.list_protocols())
+
+@lru_cache(maxsize=1)
+def _metadata_json(generation: int) -> bytes:
+    return render_json(manager.list_metadata())
+
+@lru_cache(maxsize=256)
+def _types_json(generation: int, protocol: str) -> Optional[bytes]:
+    type_names = manager.get_sorted_type_names(protocol)
+    return None if type_names is None else render_json(type_names)
+
+@lru_cache(maxsize=512)
+def _type_definition_json(generation: int, protocol: str, type_name: str) -> Optional[bytes]:
+    compiler = manager.get_compiler(protocol)
+    type_obj = compiler.types.get(type_name) if compiler else None
+    if type_obj is None:
+        return None
+    return render_json(jsonable_encoder({
+        "definition": str(type_obj),
+        "tree": build_type_tree(type_obj),
+    }))
+
 @router.get("/protocols")
 async def list_protocols():
-    return manager.list_protocols()
+    return json_bytes_response(_protocols_json(manager.get_generation()))
 
 @router.get("/protocols/metadata")
 async def list_protocol_metadata():
-    return manager.list_metadata()
+    return json_bytes_response(_metadata_json(manager.get_generation()))
 
 @router.get("/protocols/{protocol}/metadata")
 async def get_metadata(protocol: str):
@@ -113,10 +148,10 @@ async def get_metadata(protocol: str):
 
 @router.get("/protocols/{protocol}/types")
 async def list_types(protocol: str):
-    metadata = manager.get_protocol_metadata(protocol)
-    if not metadata:
+    body = _types_json(manager.get_generation(), protocol)
+    if body is None:
         raise HTTPException(status_code=404, detail=f"Protocol '{protocol}' not found")
-    return metadata["types"]
+    return json_bytes_response(body)
 
 @router.get("/protocols/{protocol}/examples")
 async def list_examples(protocol: str):
@@ -137,10 +172,11 @@ async def get_type_definition(protocol: str, type_name: str):
     if not type_obj:
          raise HTTPException(status_code=404, detail=f"Type '{type_name}' not found")
 
-    return {
-        "definition": str(type_obj),
-        "tree": build_type_tree(type_obj),
-    }
+    body = _type_definition_json(manager.get_generation(), protocol, type_name)
+    if body is None:
+         # The type vanished in a reload since the lookup above
+         raise HTTPException(status_code=404, detail=f"Type '{type_name}' not found")
+    return json_bytes_response(body)
 
 
 def generate_default_value(type_tree: dict) -> Any:
@@ -228,12 +264,117 @@ async def get_type_example(protocol: str, type_name: str):
     }
 
 
-@router.post("/debug/normalize")
+@router.post("/debug/normalize", response_class=FastJSONResponse)
 async def debug_normalize(payload: Dict[str, Any]):
     """Temporary endpoint to inspect how payloads are normalized."""
     return deserialize_asn1_data(payload)
 
-@router.post("/decode")
+def _describe_decode_error(type_name: str, error: Exception) -> Tuple[str, str]:
+    """Return (error, detail) messages for a failed decode attempt."""
+    if isinstance(error, asn1tools.ConstraintsError):
+        message = f"Constraints Error in '{type_name}': {str(error)}"
+        return message, message
+    if isinstance(error, asn1tools.DecodeError):
+        message = f"Decode Error in '{type_name}': {str(error)}"
+        return message, message
+    return str(error), f"Error in '{type_name}': {str(error)}"
+
+@lru_cache(maxsize=1024)
+def _decode_payload(protocol: str, generation: int, type_name_hint: Optional[str], data_bytes: bytes) -> Dict[str, Any]:
+    """
+    Decode data_bytes and build the /decode response body.
+
+    Decoding is a pure function of the compiled protocol and the payload, so
+    results are memoised. `generation` is the manager's load counter: a reload
+    changes it, so stale entries are never hit again.
+    """
+    compiler = manager.get_compiler(protocol)
+    if not compiler:
+        # Only reachable if the protocol vanished in a reload after the handler's lookup
+        return {
+            "status": "failure",
+            "protocol": protocol,
+            "decoded_type": type_name_hint or "Unknown",
+            "error": f"Protocol '{protocol}' not found",
+            "diagnostics": f"Protocol '{protocol}' not found"
+        }
+
+    # Attempt to decode. 
+    # Note: asn1tools 'decode' usually requires knowing the top-level type 
+    # OR it tries to guess if the message is self-delimiting (BER) or if we provide a type name.
+    # For PER, we usually need the Type Name.
+    # MVP strategy: Try to decode against ALL top-level types in the schema? 
+    # Or ask user to specify Type?
+    # The user requirement said: "selectable message types".
+    # So we probably need to let user pick the type, or list available types.
+    # For now, let's try to decode using the first successful type or add a field to request.
+
+    # We'll just decode blindly if the tool supports it, or iterate types.
+    # asn1tools `decode` takes a `type_name`.
+    # Let's assume for MVP we expose a list of types and user picks one, 
+    # OR we try to guess (hard for PER).
+
+    # Let's iterate over types for now if type not specified (not in request yet).
+    # We will update DecodeRequest to include optional 'type_name'.
+
+    decoded = None
+    decoded_type = "Unknown"
+
+    # Get all types
+    types = (type_name_hint,) if type_name_hint else manager.get_type_names(protocol)
+
+    success = False
+    last_failure = None
+    error_details = []
+
+    for type_name in types:
+        try:
+            decoded = compiler.decode(type_name, data_bytes, check_constraints=True)
+            decoded_type = type_name
+            success = True
+            break
+        except Exception as e:
+            # Blind decode misses on most types; only format the messages we report
+            last_failure = (type_name, e)
+            if len(error_details) < 3:
+                error_details.append(_describe_decode_error(type_name, e)[1])
+            continue
+
+    last_error = _describe_decode_error(*last_failure)[0] if last_failure else ""
+
+    if not success:
+         # If specific type was requested, return failure object
+         if type_name_hint:
+             return {
+                 "status": "failure",
+                 "protocol": protocol,
+                 "decoded_type": type_name_hint,
+                 "error": last_error,
+                 "diagnostics": last_error
+             }
+
+         # Return a summary of errors if blindly trying all types
+         return {
+             "status": "failure",
+             "protocol": protocol,
+             "decoded_type": "Unknown",
+             "error": "Could not decode against any type.",
+             "diagnostics": f"Errors: {'; '.join(error_details[:3])}..."
+         }
+
+    # Convert decoded object (which might have bytes) to JSON serializable
+    # primitive version of asn1tools decode result is usually dicts and python types.
+    # We need a helper to serialize bytes/bytearrays to hex strings for JSON.
+
+    return {
+        "status": "success",
+        "protocol": protocol,
+        "decoded_type": decoded_type,
+        "data": serialize_asn1_data(decoded)
+    }
+
+
+@router.post("/decode", response_class=FastJSONResponse)
 async def decode_message(request: DecodeRequest):
     compiler = manager.get_compiler(request.protocol)
     if not compiler:
@@ -241,88 +382,13 @@ async def decode_message(request: DecodeRequest):
 
     try:
         # Remove 0x prefix and whitespace
-        clean_hex = request.hex_data.replace("0x", "").replace(" ", "").replace("\n", "")
-        data_bytes = bytes.fromhex(clean_hex)
-        
-        # Attempt to decode. 
-        # Note: asn1tools 'decode' usually requires knowing the top-level type 
-        # OR it tries to guess if the message is self-delimiting (BER) or if we provide a type name.
-        # For PER, we usually need the Type Name.
-        # MVP strategy: Try to decode against ALL top-level types in the schema? 
-        # Or ask user to specify Type?
-        # The user requirement said: "selectable message types".
-        # So we probably need to let user pick the type, or list available types.
-        # For now, let's try to decode using the first successful type or add a field to request.
-        
-        # We'll just decode blindly if the tool supports it, or iterate types.
-        # asn1tools `decode` takes a `type_name`.
-        # Let's assume for MVP we expose a list of types and user picks one, 
-        # OR we try to guess (hard for PER).
-        
-        # Let's iterate over types for now if type not specified (not in request yet).
-        # We will update DecodeRequest to include optional 'type_name'.
-        
-        decoded = None
-        decoded_type = "Unknown"
+        data_bytes = hex_to_bytes(request.hex_data)
         
-        # Get all types
-        types = [request.type_name] if request.type_name else compiler.types.keys()
-        
-        success = False
-        last_error = ""
-        error_details = []
-
-        for type_name in types:
-            try:
-                decoded = compiler.decode(type_name, data_bytes, check_constraints=True)
-                decoded_type = type_name
-                success = True
-                break
-            except asn1tools.ConstraintsError as e:
-                error_msg = f"Constraints Error in '{type_name}': {str(e)}"
-                last_error = error_msg
-                error_details.append(error_msg)
-                continue
-            except asn1tools.DecodeError as e:
-                error_msg = f"Decode Error in '{type_name}': {str(e)}"
-                last_error = error_msg
-                error_details.append(error_msg)
-                continue
-            except Exception as e:
-                last_error = str(e)
-                error_details.append(f"Error in '{type_name}': {str(e)}")
-                continue
-        
-        if not success:
-             # If specific type was requested, return failure object
-             if request.type_name:
-                 return {
-                     "status": "failure",
-                     "protocol": request.protocol,
-                     "decoded_type": request.type_name,
-                     "error": last_error,
-                     "diagnostics": last_error
-                 }
-             
-             # Return a summary of errors if blindly trying all types
-             return {
-                 "status": "failure",
-                 "protocol": request.protocol,
-                 "decoded_type": "Unknown",
-                 "error": "Could not decode against any type.",
-                 "diagnostics": f"Errors: {'; '.join(error_details[:3])}..."
-             }
-
-        # Convert decoded object (which might have bytes) to JSON serializable
-        # primitive version of asn1tools decode result is usually dicts and python types.
-        # We need a helper to serialize bytes/bytearrays to hex strings for JSON.
-        
-        return {
-            "status": "success",
-            "protocol": request.protocol,
-            "decoded_type": decoded_type,
-            "data": serialize_asn1_data(decoded)
-        }
+        # The payload is already JSON-ready, so skip the jsonable_encoder pass
+        payload = await asyncio.to_thread(
+            _decode_payload, request.protocol, manager.get_generation(), request.type_name, data_bytes
+        )
+        return FastJSONResponse(payload)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -330,13 +396,39 @@ async def decode_message(request: DecodeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/trace")
+# Traces of small payloads are memoised as rendered response bytes, so cached
+# entries share no mutable trace tree. Larger payloads are traced afresh each time.
+_TRACE_CACHE_MAX_HEX = 4096
+
+def _render_trace(protocol: str, type_name: str, hex_data: str) -> bytes:
+    result = trace_service.trace(protocol, type_name, hex_data)
+    return render_json({
+        "status": "success",
+        "protocol": result.protocol,
+        "type_name": result.type_name,
+        "decoded": serialize_asn1_data(result.decoded),
+        "trace": result.root.to_dict(),
+        "total_bits": result.total_bits,
+    })
+
+@lru_cache(maxsize=64)
+def _trace_json(protocol: str, generation: int, type_name: str, hex_data: str) -> bytes:
+    # `generation` keys the entry to one protocol load, as for _decode_payload
+    return _render_trace(protocol, type_name, hex_data)
+
+def _trace_body(protocol: str, type_name: str, hex_data: str) -> bytes:
+    clean_hex = strip_hex(hex_data)
+    if len(clean_hex) > _TRACE_CACHE_MAX_HEX:
+        return _render_trace(protocol, type_name, clean_hex)
+    return _trace_json(protocol, manager.get_generation(), type_name, clean_hex)
+
+@router.post("/trace", response_class=FastJSONResponse)
 async def trace_message(request: TraceRequest):
     if request.encoding_rule.lower() != "per":
         raise HTTPException(status_code=400, detail="Tracing currently supports PER only.")
 
     try:
-        result = trace_service.trace(request.protocol, request.type_name, request.hex_data)
+        body = await asyncio.to_thread(_trace_body, request.protocol, request.type_name, request.hex_data)
     except ValueError as exc:
         # Hex format error or similar - arguably user error, but consistent with 'diagnostics' approach
         # we can return it as failure.
@@ -366,14 +458,13 @@ async def trace_message(request: TraceRequest):
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Internal Error: {str(exc)}")
 
-    return {
-        "status": "success",
-        "protocol": result.protocol,
-        "type_name": result.type_name,
-        "decoded": serialize_asn1_data(result.decoded),
-        "trace": result.root.to_dict(),
-        "total_bits": result.total_bits,
-    }
+    return json_bytes_response(body)
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 @router.post("/codegen")
 async def generate_code(request: CodegenRequest):
@@ -384,11 +475,14 @@ async def generate_code(request: CodegenRequest):
             options=request.options
         )
         filename = os.path.basename(zip_path)
+        # Stat once up front so FileResponse skips its own stat; the zip is a
+        # one-shot artifact, removed once the response has been sent.
         return FileResponse(
             path=zip_path, 
             filename=filename, 
             media_type='application/zip',
-            background=None # TODO: Add background task to delete file
+            stat_result=os.stat(zip_path),
+            background=BackgroundTask(_remove_file, zip_path)
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
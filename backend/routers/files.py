@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
 import os
+import re
 from backend.core.manager import manager
 
 router = APIRouter()
@@ -13,36 +15,54 @@ class CreateFileRequest(BaseModel):
     filename: str
     content: Optional[str] = None
 
+# Path separators or parent references, checked in a single scan
+_INVALID_FILENAME = re.compile(r"[\\/]|\.\.")
+
+# Blocking disk work runs via asyncio.to_thread so slow storage doesn't stall the event loop
+
+def _read_text(filepath: str) -> str:
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _write_text(filepath: str, content: str) -> None:
+    # Unbuffered write with no fsync: durability is left to OS writeback, and
+    # the debounced reload is what actually picks the change up
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
 @router.get("/protocols/{protocol}/files")
 async def list_files(protocol: str):
-    path = manager.get_protocol_path(protocol)
-    if not path:
-        raise HTTPException(404, "Protocol not found")
-    
-    # List .asn files
     try:
-        files = [f for f in os.listdir(path) if f.endswith('.asn')]
-        return files
+        file_map = await asyncio.to_thread(manager.get_file_map, protocol)
     except Exception as e:
         raise HTTPException(500, str(e))
+    if file_map is None:
+        raise HTTPException(404, "Protocol not found")
+    
+    # List .asn files
+    return [f for f in file_map if f.endswith('.asn')]
 
 @router.get("/protocols/{protocol}/files/{filename}")
 async def read_file(protocol: str, filename: str):
-    path = manager.get_protocol_path(protocol)
-    if not path:
+    file_map = await asyncio.to_thread(manager.get_file_map, protocol)
+    if file_map is None:
         raise HTTPException(404, "Protocol not found")
     
     # Security check
-    if ".." in filename or "/" in filename or "\\" in filename:
+    if _INVALID_FILENAME.search(filename):
          raise HTTPException(400, "Invalid filename")
          
-    filepath = os.path.join(path, filename)
-    if not os.path.exists(filepath):
+    filepath = file_map.get(filename)
+    if filepath is None:
          raise HTTPException(404, "File not found")
          
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return {"content": f.read()}
+        return {"content": await asyncio.to_thread(_read_text, filepath)}
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -52,18 +72,17 @@ async def write_file(protocol: str, filename: str, body: FileContent):
     if not path:
         raise HTTPException(404, "Protocol not found")
     
-    if ".." in filename or "/" in filename or "\\" in filename:
+    if _INVALID_FILENAME.search(filename):
          raise HTTPException(400, "Invalid filename")
 
     filepath = os.path.join(path, filename)
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(body.content)
+        await asyncio.to_thread(_write_text, filepath, body.content)
     except Exception as e:
         raise HTTPException(500, str(e))
     
-    # Trigger reload so changes take effect in the compiler
-    errors = manager.reload()
+    # Trigger reload so changes take effect in the compiler (coalesced across rapid saves)
+    errors = await manager.schedule_reload()
     if protocol in errors:
          # We return 200 because the file WAS saved, but we warn the user
          return {
@@ -81,24 +100,23 @@ async def create_file(protocol: str, body: CreateFileRequest):
         raise HTTPException(404, "Protocol not found")
     
     filename = body.filename
-    if ".." in filename or "/" in filename or "\\" in filename:
+    if _INVALID_FILENAME.search(filename):
          raise HTTPException(400, "Invalid filename")
     
     if not filename.endswith('.asn'):
         raise HTTPException(400, "Filename must end with .asn")
 
     filepath = os.path.join(path, filename)
-    if os.path.exists(filepath):
+    if await asyncio.to_thread(os.path.exists, filepath):
         raise HTTPException(409, "File already exists")
 
     try:
         content = body.content if body.content is not None else "-- New ASN.1 Module\n"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        await asyncio.to_thread(_write_text, filepath, content)
     except Exception as e:
         raise HTTPException(500, str(e))
         
-    errors = manager.reload()
+    errors = await manager.schedule_reload()
     if protocol in errors:
          return {
              "status": "warning",
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from pydantic_core import to_json
+import asyncio
+import hashlib
 import os
-import json
-import glob
-from typing import Any
+import re
+import stat
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
 from backend.core.config import config_manager
+from backend.core.responses import (
+    is_not_modified,
+    json_bytes_response,
+    not_modified_response,
+    render_json,
+)
 
 router = APIRouter()
 
@@ -14,74 +26,212 @@ class SaveMessageRequest(BaseModel):
     type: str
     data: Any
 
+class BulkSaveRequest(BaseModel):
+    messages: List[SaveMessageRequest]
+
+# Path separators anywhere, or a leading dot (hidden files and "..")
+_INVALID_MESSAGE_NAME = re.compile(r"[\\/]|\A\.")
+
+def _message_path(filename: str) -> str:
+    """Resolve a saved-message filename inside the messages folder, rejecting traversal."""
+    if _INVALID_MESSAGE_NAME.search(filename):
+        raise HTTPException(400, "Invalid filename")
+    return os.path.join(config_manager.get_messages_path(), filename)
+
+# Blocking disk work runs via asyncio.to_thread so slow storage doesn't stall the event loop
+
+# (path, directory mtime_ns, JSON body, ETag) of the last listing. Adding or removing
+# entries bumps the directory mtime; handlers that change the folder also reset it.
+_list_cache: Optional[Tuple[str, int, bytes, str]] = None
+
+def _invalidate_listing() -> None:
+    global _list_cache
+    _list_cache = None
+
+def _listing_etag(names: List[str]) -> str:
+    # Derived from the names themselves, so it only changes when the listing does
+    return f'W/"{zlib.crc32(chr(0).join(names).encode("utf-8")):08x}-{len(names):x}"'
+
+def _list_json_files(path: str) -> Tuple[bytes, str]:
+    """Sorted *.json names in path as a serialized JSON array, plus its ETag."""
+    global _list_cache
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return b"[]", _listing_etag([])
+    cached = _list_cache
+    if cached is not None and cached[0] == path and cached[1] == mtime:
+        return cached[2], cached[3]
+    with os.scandir(path) as entries:
+        names = sorted(e.name for e in entries if e.name.endswith('.json') and not e.name.startswith('.'))
+    body, etag = render_json(names), _listing_etag(names)
+    _list_cache = (path, mtime, body, etag)
+    return body, etag
+
+# filepath -> (mtime_ns, size, content hash) for files this process wrote. The hash is a
+# strong ETag that does not depend on mtime resolution; it is only trusted while the
+# file's stat still matches what was recorded after the write.
+_content_etags: Dict[str, Tuple[int, int, str]] = {}
+
+def _content_etag(filepath: str, stat_result: os.stat_result) -> Optional[str]:
+    record = _content_etags.get(filepath)
+    if record is not None and record[0] == stat_result.st_mtime_ns and record[1] == stat_result.st_size:
+        return record[2]
+    return None
+
+def _write_bytes(path: str, filepath: str, data: bytes) -> None:
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    try:
+        if _content_etag(filepath, os.stat(filepath)) == digest:
+            return  # Identical content is already on disk
+    except FileNotFoundError:
+        pass
+    os.makedirs(path, exist_ok=True)
+    # Write a sibling temp file and rename it over the target, so readers never see
+    # a half-written message. The per-thread name keeps concurrent saves apart.
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # Raw fd and os.write: the payload is already one bytes object, so skip the buffered IO layer
+        view = memoryview(data)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
+        written = os.stat(filepath)
+        _content_etags[filepath] = (written.st_mtime_ns, written.st_size, digest)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _remove_if_exists(filepath: str) -> None:
+    _content_etags.pop(filepath, None)
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+def _scan_json_paths(path: str) -> List[str]:
+    try:
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.name.endswith('.json') and not entry.name.startswith('.')]
+    except FileNotFoundError:
+        return []
+
 @router.get("")
-async def list_messages():
+async def list_messages(request: Request):
     path = config_manager.get_messages_path()
-    if not os.path.exists(path):
-        return []
-    files = sorted(glob.glob(os.path.join(path, "*.json")))
-    return [os.path.basename(f) for f in files]
+    body, etag = await asyncio.to_thread(_list_json_files, path)
+    headers = {"etag": etag}
+    if is_not_modified(request.headers, headers):
+        return not_modified_response(headers)
+    return json_bytes_response(body, headers=headers)
+
+def _json_filename(filename: str) -> str:
+    return filename if filename.endswith('.json') else filename + '.json'
+
+def _encode_message(req: SaveMessageRequest) -> bytes:
+    # pydantic-core writes JSON bytes straight from the model, with no intermediate dict;
+    # compact unless the user opted into indented files
+    return to_json(req, indent=2 if config_manager.get().pretty_json else None) + b"\n"
 
 @router.post("")
 async def save_message(req: SaveMessageRequest):
-    path = config_manager.get_messages_path()
-    if not os.path.exists(path):
-        os.makedirs(path)
-    
-    filename = req.filename
-    if not filename.endswith('.json'):
-        filename += '.json'
-        
-    filepath = os.path.join(path, filename)
-    
+    filename = _json_filename(req.filename)
+
+    filepath = _message_path(filename)
+    path = os.path.dirname(filepath)
+
     try:
-        with open(filepath, 'w') as f:
-            json.dump(req.model_dump(), f, indent=2)
+        await asyncio.to_thread(_write_bytes, path, filepath, _encode_message(req))
     except Exception as e:
         raise HTTPException(500, f"Failed to save: {e}")
-        
+    finally:
+        _invalidate_listing()
+
     return {"status": "success", "filename": filename}
 
+@router.post("/bulk")
+async def bulk_save_messages(req: BulkSaveRequest):
+    """Save several messages in one request, writing them concurrently."""
+    results: List[Dict[str, Any]] = []
+    writes = []
+    for message in req.messages:
+        filename = _json_filename(message.filename)
+        try:
+            filepath = _message_path(filename)
+        except HTTPException as e:
+            results.append({"status": "failure", "filename": filename, "error": e.detail})
+            continue
+        results.append({"status": "success", "filename": filename})
+        writes.append((results[-1], asyncio.to_thread(_write_bytes, os.path.dirname(filepath), filepath, _encode_message(message))))
+
+    outcomes = await asyncio.gather(*(write for _, write in writes), return_exceptions=True)
+    _invalidate_listing()
+    for (result, _), outcome in zip(writes, outcomes):
+        if isinstance(outcome, Exception):
+            result.update(status="failure", error=f"Failed to save: {outcome}")
+
+    # Clients that only check the top-level status must still see lost messages
+    failed = sum(result["status"] == "failure" for result in results)
+    if not failed:
+        status = "success"
+    elif failed == len(results):
+        status = "failure"
+    else:
+        status = "partial"
+    return {"status": status, "results": results}
+
 @router.get("/{filename}")
-async def load_message(filename: str):
-    path = config_manager.get_messages_path()
-    filepath = os.path.join(path, filename)
-    if not os.path.exists(filepath):
-        raise HTTPException(404, "Message not found")
-    
+async def load_message(filename: str, request: Request):
+    filepath = _message_path(filename)
+
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        stat_result = await asyncio.to_thread(os.stat, filepath)
+    except FileNotFoundError:
+        raise HTTPException(404, "Message not found")
     except Exception as e:
         raise HTTPException(500, f"Failed to load: {e}")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(404, "Message not found")
+    # Files are written by save_message, so stream the stored JSON as-is
+    response = FileResponse(filepath, media_type="application/json", stat_result=stat_result)
+    content_etag = _content_etag(filepath, stat_result)
+    if content_etag is not None:
+        response.headers["etag"] = f'"{content_etag}"'
+    # ETag/Last-Modified come from the content hash or the stat; unchanged files need no body
+    if is_not_modified(request.headers, response.headers):
+        return not_modified_response(response.headers)
+    return response
 
 @router.delete("/{filename}")
 async def delete_message(filename: str):
-    path = config_manager.get_messages_path()
-    filepath = os.path.join(path, filename)
-    if os.path.exists(filepath):
-        try:
-            os.remove(filepath)
-        except Exception as e:
-            raise HTTPException(500, f"Failed to delete: {e}")
+    filepath = _message_path(filename)
+    try:
+        await asyncio.to_thread(_remove_if_exists, filepath)
+    except Exception as e:
+        raise HTTPException(500, f"Failed to delete: {e}")
+    finally:
+        _invalidate_listing()
     return {"status": "success"}
 
 @router.delete("")
 async def clear_messages():
     path = config_manager.get_messages_path()
-    if os.path.exists(path):
-        try:
-            files = glob.glob(os.path.join(path, "*.json"))
-            for f in files:
-                os.remove(f)
-        except Exception as e:
-            raise HTTPException(500, f"Failed to clear: {e}")
+    try:
+        files = await asyncio.to_thread(_scan_json_paths, path)
+    except Exception as e:
+        raise HTTPException(500, f"Failed to clear: {e}")
+    # Overlap the unlinks; files already gone (e.g. a concurrent delete) are fine
+    results = await asyncio.gather(*(asyncio.to_thread(os.unlink, f) for f in files), return_exceptions=True)
+    _invalidate_listing()
+    _content_etags.clear()
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, FileNotFoundError):
+            raise HTTPException(500, f"Failed to clear: {result}")
     return {"status": "success"}
-
-
-
-
-
-
-
-
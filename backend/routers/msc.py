@@ -1,6 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
 
 from backend.application.msc.services import (
     MscApplicationService, 
@@ -8,7 +16,24 @@ from backend.application.msc.services import (
     IdentifierDetectionResponse
 )
 from backend.infrastructure.msc.dependencies import get_msc_service
-from backend.domain.msc.entities import ValidationType
+from backend.domain.msc.entities import (
+    MscMessage,
+    MscSequence,
+    MscSession,
+    TrackedIdentifier,
+    ValidationResult,
+    ValidationType,
+)
+from backend.core.asn1_runtime import asn1tools
+from backend.core.responses import (
+    FastJSONResponse,
+    is_not_modified,
+    json_bytes_response,
+    not_modified_response,
+    render_json,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/msc",
@@ -108,24 +133,88 @@ class FieldSuggestionResponse(CamelModel):
     reason: Optional[str] = None
 
 
-def build_sequence_response(dto: SequenceDTO) -> SequenceResponse:
-    return SequenceResponse(
-        id=dto.id,
-        name=dto.name,
-        protocol=dto.protocol,
-        session_id=dto.session_id,  # Ensure this is passed
-        messages=[MessageResponse(**msg) for msg in dto.messages],
-        sub_sequences=dto.sub_sequences,
-        configurations={
-            name: TrackedIdentifierResponse(**identifier)
-            for name, identifier in dto.tracked_identifiers.items()
-        },
-        validation_results=[ValidationIssueResponse(**result) for result in dto.validation_results],
-        created_at=dto.created_at,
-        updated_at=dto.updated_at
-    )
+def model_json_response(content: Any) -> FastJSONResponse:
+    """Render response models (or a list of them) in camelCase straight to a response.
+
+    Returning a Response skips FastAPI's jsonable_encoder pass. Routes set
+    response_model=None and name their model under responses={200: ...} instead,
+    so it is only used for the OpenAPI docs and never to validate the response.
+    """
+    if isinstance(content, list):
+        return FastJSONResponse([item.model_dump(mode="json", by_alias=True) for item in content])
+    return FastJSONResponse(content.model_dump(mode="json", by_alias=True))
+
+
+def conditional_json_response(request: Request, content: Any) -> Response:
+    """Render content with a content-hash ETag, answering 304 if the client already has it.
+
+    The hash covers the rendered body, so it changes with any edit to a sequence
+    regardless of whether the edit bumped updated_at.
+    """
+    body = render_json(content)
+    headers = {"etag": f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'}
+    if is_not_modified(request.headers, headers):
+        return not_modified_response(headers)
+    return json_bytes_response(body, headers=headers)
+
+
+def _issues_json(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not issues:
+        return []  # The common case; skip building a comprehension
+    return [
+        {
+            "type": issue["type"],
+            "message": issue["message"],
+            "field": issue["field"],
+            "messageIndex": issue["message_index"],
+            "code": issue["code"],
+        }
+        for issue in issues
+    ]
+
+
+def build_sequence_response(dto: SequenceDTO) -> Dict[str, Any]:
+    """The SequenceResponse JSON for a DTO, built directly as a camelCase dict.
+
+    DTO fields are already JSON-ready, so no response models are built (and thrown
+    away) on the way. The keys must stay in step with SequenceResponse, which
+    documents this shape in the OpenAPI schema.
+    """
+    messages: List[Dict[str, Any]] = []
+    add_message = messages.append
+    for msg in dto.messages:
+        add_message({
+            "id": msg["id"],
+            "typeName": msg["type_name"],
+            "data": msg["data"],
+            "sourceActor": msg["source_actor"],
+            "targetActor": msg["target_actor"],
+            "timestamp": msg["timestamp"],
+            "validationErrors": _issues_json(msg["validation_errors"]),
+        })
+    configurations = {
+        name: {
+            "name": identifier["name"],
+            "values": identifier["values"],
+            "isConsistent": identifier["is_consistent"],
+            "conflicts": identifier["conflicts"],
+        }
+        for name, identifier in dto.tracked_identifiers.items()
+    }
+    return {
+        "id": dto.id,
+        "name": dto.name,
+        "protocol": dto.protocol,
+        "sessionId": dto.session_id,
+        "messages": messages,
+        "subSequences": dto.sub_sequences,
+        "configurations": configurations,
+        "validationResults": _issues_json(dto.validation_results),
+        "createdAt": dto.created_at,
+        "updatedAt": dto.updated_at,
+    }
 
-@router.post("/sequences", response_model=SequenceResponse)
+@router.post("/sequences", response_model=None, responses={200: {"model": SequenceResponse}})
 async def create_sequence(
     request: CreateSequenceRequest,
     msc_service: MscApplicationService = Depends(get_msc_service)
@@ -134,13 +223,14 @@ async def create_sequence(
     try:
         dto = msc_service.create_sequence(request.name, request.protocol, request.session_id)
         # Convert DTO to Pydantic model
-        return build_sequence_response(dto)
+        return FastJSONResponse(build_sequence_response(dto))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to create sequence: {str(e)}")
 
-@router.get("/sequences/{sequence_id}", response_model=SequenceResponse)
+@router.get("/sequences/{sequence_id}", response_model=None, responses={200: {"model": SequenceResponse}})
 async def get_sequence(
     sequence_id: str,
+    request: Request,
     msc_service: MscApplicationService = Depends(get_msc_service)
 ):
     """Retrieve an existing MSC sequence."""
@@ -148,14 +238,13 @@ async def get_sequence(
         dto = msc_service.get_sequence(sequence_id)
         if not dto:
             raise HTTPException(status_code=404, detail="Sequence not found")
-        # Convert DTO to Pydantic model
-        return build_sequence_response(dto)
+        return conditional_json_response(request, build_sequence_response(dto))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve sequence: {str(e)}")
 
-@router.put("/sequences/{sequence_id}", response_model=SequenceResponse)
+@router.put("/sequences/{sequence_id}", response_model=None, responses={200: {"model": SequenceResponse}})
 async def update_sequence(
     sequence_id: str,
     request: UpdateSequenceRequest,
@@ -181,7 +270,7 @@ async def update_sequence(
             raise HTTPException(status_code=404, detail="Sequence not found")
         
         # Convert DTO to Pydantic model
-        return build_sequence_response(dto)
+        return FastJSONResponse(build_sequence_response(dto))
     except HTTPException:
         raise
     except Exception as e:
@@ -203,7 +292,7 @@ async def delete_sequence(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete sequence: {str(e)}")
 
-@router.post("/sequences/{sequence_id}/messages", response_model=SequenceResponse)
+@router.post("/sequences/{sequence_id}/messages", response_model=None, responses={200: {"model": SequenceResponse}})
 async def add_message_to_sequence(
     sequence_id: str,
     request: AddMessageRequest,
@@ -219,7 +308,7 @@ async def add_message_to_sequence(
         }
         dto = msc_service.add_message_to_sequence(sequence_id, message_data)
         # Convert DTO to Pydantic model
-        return build_sequence_response(dto)
+        return FastJSONResponse(build_sequence_response(dto))
     except ValueError as e:
         # Sequence not found
         if "not found" in str(e).lower():
@@ -231,7 +320,7 @@ async def add_message_to_sequence(
         raise HTTPException(status_code=400, detail=f"Failed to add message: {str(e)}")
 
 
-@router.post("/sequences/{sequence_id}/validate", response_model=ValidationResponseModel)
+@router.post("/sequences/{sequence_id}/validate", response_model=None, responses={200: {"model": ValidationResponseModel}})
 async def validate_sequence(
     sequence_id: str,
     msc_service: MscApplicationService = Depends(get_msc_service)
@@ -240,30 +329,36 @@ async def validate_sequence(
     try:
         results = msc_service.validate_sequence(sequence_id)
         
-        issue_responses = [
-            ValidationIssueResponse(
+        # One pass builds the issues and counts errors and warnings together
+        issue_responses = []
+        error_count = warning_count = 0
+        for r in results:
+            if r.type is ValidationType.ERROR:
+                error_count += 1
+            elif r.type is ValidationType.WARNING:
+                warning_count += 1
+            issue_responses.append(ValidationIssueResponse.model_construct(
                 type=r.type.value,
                 message=r.message,
                 field=r.field,
                 message_index=r.message_index,
                 code=r.code
-            ) for r in results
-        ]
+            ))
 
-        response = ValidationResponseModel(
+        response = ValidationResponseModel.model_construct(
             results=issue_responses,
-            has_errors=any(r.type == ValidationType.ERROR for r in results),
-            error_count=sum(1 for r in results if r.type == ValidationType.ERROR),
-            warning_count=sum(1 for r in results if r.type == ValidationType.WARNING)
+            has_errors=error_count > 0,
+            error_count=error_count,
+            warning_count=warning_count
         )
         
-        return response
+        return model_json_response(response)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to validate sequence: {str(e)}")
 
-@router.get("/protocols/{protocol}/identifiers/{type_name}", response_model=IdentifierResponse)
+@router.get("/protocols/{protocol}/identifiers/{type_name}", response_model=None, responses={200: {"model": IdentifierResponse}})
 async def detect_identifiers(
     protocol: str,
     type_name: str,
@@ -279,17 +374,17 @@ async def detect_identifiers(
             type_name=type_name
         )
         
-        return IdentifierResponse(
+        return model_json_response(IdentifierResponse.model_construct(
             identifiers=response.identifiers,
             protocol=response.protocol,
             type_name=response.type_name,
             count=response.count,
             detected_at=response.detected_at
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to detect identifiers: {str(e)}")
 
-@router.get("/sequences/{sequence_id}/suggestions", response_model=List[FieldSuggestionResponse])
+@router.get("/sequences/{sequence_id}/suggestions", response_model=None, responses={200: {"model": List[FieldSuggestionResponse]}})
 async def get_field_suggestions(
     sequence_id: str,
     message_index: int,
@@ -307,12 +402,145 @@ async def get_field_suggestions(
             protocol,
             type_name
         )
-        return [FieldSuggestionResponse(**suggestion) for suggestion in suggestions]
+        return model_json_response([FieldSuggestionResponse(**suggestion) for suggestion in suggestions])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get field suggestions: {str(e)}")
 
-@router.get("/sequences", response_model=List[SequenceResponse])
+# Example sequences shipped next to the saved ones
+_EXAMPLE_DIR = Path(__file__).parent.parent / "msc_storage"
+
+# path -> (mtime_ns, protocol in the file, parsed sequence); files are only re-read when they change
+_example_cache: Dict[str, Tuple[int, Optional[str], MscSequence]] = {}
+
+# (example directory, sorted (file name, mtime_ns) of its example files, protocol -> example
+# sequence JSON, with None listing every example). One scandir pass per request detects added,
+# removed and edited files alike; reorganize_storage also resets it.
+_example_registry: Optional[Tuple[Path, Tuple[Tuple[str, int], ...], Dict[Optional[str], List[Dict[str, Any]]]]] = None
+
+# Schema of the example files. pydantic-core parses a whole file straight from its
+# bytes, converting enums, integer message indexes and timestamps on the way.
+class ExampleIssue(BaseModel):
+    type: ValidationType = ValidationType.ERROR
+    message: str = ""
+    field: Optional[str] = None
+    message_index: Optional[int] = None
+    code: Optional[str] = None
+
+class ExampleMessage(BaseModel):
+    id: Optional[str] = None
+    type_name: str = ""
+    data: Any = Field(default_factory=dict)
+    source_actor: str = "UE"
+    target_actor: str = "gNB"
+    timestamp: float = 0.0
+    validation_errors: List[ExampleIssue] = Field(default_factory=list)
+
+class ExampleIdentifier(BaseModel):
+    name: Optional[str] = None
+    values: Dict[int, Any] = Field(default_factory=dict)
+    conflicts: List[str] = Field(default_factory=list)
+
+class ExampleSequenceFile(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = "Example"
+    protocol: Optional[str] = None
+    messages: List[ExampleMessage] = Field(default_factory=list)
+    tracked_identifiers: Dict[str, ExampleIdentifier] = Field(default_factory=dict)
+    created_at: datetime = datetime(2025, 1, 1)
+    updated_at: datetime = datetime(2025, 1, 1)
+
+def _parse_example(example: ExampleSequenceFile) -> MscSequence:
+    return MscSequence(
+        id=example.id,
+        name=example.name,
+        protocol=example.protocol if example.protocol is not None else "nr_rel17_rrc",
+        messages=[
+            MscMessage(
+                id=msg.id,
+                type_name=msg.type_name,
+                data=msg.data,
+                source_actor=msg.source_actor,
+                target_actor=msg.target_actor,
+                timestamp=msg.timestamp,
+                validation_errors=[
+                    ValidationResult(
+                        type=error.type,
+                        message=error.message,
+                        field=error.field,
+                        message_index=error.message_index,
+                        code=error.code
+                    )
+                    for error in msg.validation_errors
+                ]
+            )
+            for msg in example.messages
+        ],
+        tracked_identifiers={
+            name: TrackedIdentifier(
+                name=identifier.name if identifier.name is not None else name,
+                values=identifier.values,
+                conflicts=identifier.conflicts
+            )
+            for name, identifier in example.tracked_identifiers.items()
+        },
+        created_at=example.created_at,
+        updated_at=example.updated_at
+    )
+
+def _load_example(example_file: Path) -> Tuple[Optional[str], MscSequence]:
+    """The protocol named in an example file and its parsed sequence, re-read only when the file changes."""
+    key = str(example_file)
+    mtime = example_file.stat().st_mtime_ns
+    cached = _example_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        example = ExampleSequenceFile.model_validate_json(example_file.read_bytes())
+        cached = (mtime, example.protocol, _parse_example(example))
+        _example_cache[key] = cached
+    return cached[1], cached[2]
+
+def _invalidate_examples() -> None:
+    global _example_registry
+    _example_registry = None
+
+def _examples_by_protocol() -> Dict[Optional[str], List[Dict[str, Any]]]:
+    """Example sequence JSON grouped by protocol, rebuilt only when an example file changes."""
+    global _example_registry
+    example_dir = _EXAMPLE_DIR
+    try:
+        with os.scandir(example_dir) as entries:
+            signature = tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.name.startswith("example_") and entry.name.endswith(".json") and entry.is_file()
+            ))
+    except FileNotFoundError:
+        return {}
+    registry = _example_registry
+    if registry is not None and registry[:2] == (example_dir, signature):
+        return registry[2]
+
+    by_protocol: Dict[Optional[str], List[Dict[str, Any]]] = {None: []}
+    seen = set()
+    for name, _ in signature:
+        example_file = example_dir / name
+        seen.add(str(example_file))
+        try:
+            example_protocol, sequence = _load_example(example_file)
+        except Exception as e:
+            logger.warning(f"Failed to load example {example_file}: {e}")
+            continue
+        example_json = build_sequence_response(SequenceDTO(sequence))
+        by_protocol[None].append(example_json)
+        if example_protocol is not None:
+            by_protocol.setdefault(example_protocol, []).append(example_json)
+    for key in _example_cache.keys() - seen:
+        _example_cache.pop(key, None)
+    _example_registry = (example_dir, signature, by_protocol)
+    return by_protocol
+
+@router.get("/sequences", response_model=None, responses={200: {"model": List[SequenceResponse]}})
 async def list_sequences(
+    request: Request,
     protocol: Optional[str] = None,
     session_id: Optional[str] = None,
     include_examples: bool = False,
@@ -325,133 +553,30 @@ async def list_sequences(
         
         # Add example sequences if requested
         if include_examples:
-            import json
-            from pathlib import Path
-            from backend.domain.msc.entities import MscSequence, MscMessage, TrackedIdentifier
-            from datetime import datetime
-            
-            example_dir = Path(__file__).parent.parent / "msc_storage"
-            example_files = list(example_dir.glob("example_*.json"))
-            
-            for example_file in example_files:
-                try:
-                    with open(example_file, 'r', encoding='utf-8') as f:
-                        example_data = json.load(f)
-                        # Only include if protocol matches or no protocol filter
-                        if not protocol or example_data.get("protocol") == protocol:
-                            # Convert to SequenceDTO format
-                            messages = []
-                            for msg_data in example_data.get("messages", []):
-                                from backend.domain.msc.entities import ValidationResult, ValidationType
-                                validation_errors = [
-                                    ValidationResult(
-                                        type=ValidationType(error.get("type", "error")),
-                                        message=error.get("message", ""),
-                                        field=error.get("field"),
-                                        message_index=error.get("message_index"),
-                                        code=error.get("code")
-                                    )
-                                    for error in msg_data.get("validation_errors", [])
-                                ]
-                                messages.append(MscMessage(
-                                    id=msg_data.get("id"),
-                                    type_name=msg_data.get("type_name", ""),
-                                    data=msg_data.get("data", {}),
-                                    source_actor=msg_data.get("source_actor", "UE"),
-                                    target_actor=msg_data.get("target_actor", "gNB"),
-                                    timestamp=msg_data.get("timestamp", 0.0),
-                                    validation_errors=validation_errors
-                                ))
-                            
-                            tracked_identifiers = {}
-                            for name, ident_data in example_data.get("tracked_identifiers", {}).items():
-                                tracked_identifiers[name] = TrackedIdentifier(
-                                    name=ident_data.get("name", name),
-                                    values={int(k): v for k, v in ident_data.get("values", {}).items()},
-                                    conflicts=ident_data.get("conflicts", [])
-                                )
-                            
-                            example_seq = MscSequence(
-                                id=example_data.get("id"),
-                                name=example_data.get("name", "Example"),
-                                protocol=example_data.get("protocol", "nr_rel17_rrc"),
-                                messages=messages,
-                                tracked_identifiers=tracked_identifiers,
-                                created_at=datetime.fromisoformat(example_data.get("created_at", "2025-01-01T00:00:00")),
-                                updated_at=datetime.fromisoformat(example_data.get("updated_at", "2025-01-01T00:00:00"))
-                            )
-                            
-                            result.append(build_sequence_response(SequenceDTO(example_seq)))
-                except Exception as e:
-                    print(f"Failed to load example {example_file}: {e}", flush=True)
+            # Only include if protocol matches or no protocol filter
+            examples = await asyncio.to_thread(_examples_by_protocol)
+            result.extend(examples.get(protocol or None, ()))
         
-        return result
+        return conditional_json_response(request, result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list sequences: {str(e)}")
 
-@router.get("/examples/{example_name}", response_model=SequenceResponse)
+@router.get("/examples/{example_name}", response_model=None, responses={200: {"model": SequenceResponse}})
 async def get_example_sequence(
     example_name: str,
+    request: Request,
     msc_service: MscApplicationService = Depends(get_msc_service)
 ):
     """Load an example MSC sequence by name."""
     try:
-        from pathlib import Path
-        import json
-        from backend.domain.msc.entities import MscSequence, MscMessage, TrackedIdentifier, ValidationResult, ValidationType
-        from datetime import datetime
+        example_file = _EXAMPLE_DIR / f"example_{example_name}.json"
         
-        example_dir = Path(__file__).parent.parent / "msc_storage"
-        example_file = example_dir / f"example_{example_name}.json"
-        
-        if not example_file.exists():
+        # Stat and (on a cache miss) parse in a worker thread, off the event loop
+        try:
+            _, example_seq = await asyncio.to_thread(_load_example, example_file)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"Example sequence '{example_name}' not found")
-        
-        with open(example_file, 'r', encoding='utf-8') as f:
-            example_data = json.load(f)
-        
-        # Convert to MscSequence
-        messages = []
-        for msg_data in example_data.get("messages", []):
-            validation_errors = [
-                ValidationResult(
-                    type=ValidationType(error.get("type", "error")),
-                    message=error.get("message", ""),
-                    field=error.get("field"),
-                    message_index=error.get("message_index"),
-                    code=error.get("code")
-                )
-                for error in msg_data.get("validation_errors", [])
-            ]
-            messages.append(MscMessage(
-                id=msg_data.get("id"),
-                type_name=msg_data.get("type_name", ""),
-                data=msg_data.get("data", {}),
-                source_actor=msg_data.get("source_actor", "UE"),
-                target_actor=msg_data.get("target_actor", "gNB"),
-                timestamp=msg_data.get("timestamp", 0.0),
-                validation_errors=validation_errors
-            ))
-        
-        tracked_identifiers = {}
-        for name, ident_data in example_data.get("tracked_identifiers", {}).items():
-            tracked_identifiers[name] = TrackedIdentifier(
-                name=ident_data.get("name", name),
-                values={int(k): v for k, v in ident_data.get("values", {}).items()},
-                conflicts=ident_data.get("conflicts", [])
-            )
-        
-        example_seq = MscSequence(
-            id=example_data.get("id"),
-            name=example_data.get("name", "Example"),
-            protocol=example_data.get("protocol", "nr_rel17_rrc"),
-            messages=messages,
-            tracked_identifiers=tracked_identifiers,
-            created_at=datetime.fromisoformat(example_data.get("created_at", "2025-01-01T00:00:00")),
-            updated_at=datetime.fromisoformat(example_data.get("updated_at", "2025-01-01T00:00:00"))
-        )
-        
-        return build_sequence_response(SequenceDTO(example_seq))
+        return conditional_json_response(request, build_sequence_response(SequenceDTO(example_seq)))
     except HTTPException:
         raise
     except Exception as e:
@@ -467,6 +592,7 @@ async def reorganize_storage(
         from backend.infrastructure.msc.dependencies import get_msc_repository
         repo = get_msc_repository()
         result = repo.reorganize_storage()
+        _invalidate_examples()
         return {
             "status": "success",
             "reorganized": result["reorganized"],
@@ -519,37 +645,52 @@ class DecodedMessageResponse(CamelModel):
     target_actor: str = "gNB"
 
 
-@router.post("/decode-hex", response_model=DecodedMessageResponse)
-async def decode_hex_to_message(request: HexDecodeRequest):
-    """Decode a single hex string to an MSC message."""
-    from backend.core.manager import manager
+# Whitespace and commas allowed between hex bytes in pasted dumps
+_HEX_SEPARATORS = str.maketrans("", "", " \t\n\r\v\f,")
+
+# Fixed (source, target) actors of common RRC messages, applied after decoding
+_UE_TO_GNB_TYPES = frozenset({
+    'RRCSetupRequest', 'RRCSetupComplete', 'RRCReconfigurationComplete',
+    'MeasurementReport', 'SecurityModeComplete', 'UECapabilityInformation',
+    'RRCConnectionRequest', 'RRCConnectionSetupComplete'
+})
+_GNB_TO_UE_TYPES = frozenset({
+    'RRCSetup', 'RRCReconfiguration', 'RRCRelease',
+    'SecurityModeCommand', 'UECapabilityEnquiry',
+    'RRCConnectionSetup', 'RRCConnectionReconfiguration', 'RRCConnectionRelease'
+})
+_MESSAGE_DIRECTIONS: Dict[str, Tuple[str, str]] = {
+    **dict.fromkeys(_UE_TO_GNB_TYPES, ("UE", "gNB")),
+    **dict.fromkeys(_GNB_TO_UE_TYPES, ("gNB", "UE")),
+}
+
+
+def _decode_one(
+    compiler,
+    types_to_try,
+    hex_data: str,
+    type_name: Optional[str] = None,
+    source_actor: str = "UE",
+    target_actor: str = "gNB",
+) -> DecodedMessageResponse:
+    """Decode one hex string, trying each of types_to_try until one fits."""
     from backend.core.serialization import serialize_asn1_data
     
     try:
-        compiler = manager.get_compiler(request.protocol)
-        if not compiler:
-            return DecodedMessageResponse(
-                type_name=request.type_name or "Unknown",
-                data={},
-                hex=request.hex_data,
-                status="error",
-                error=f"Protocol '{request.protocol}' not found"
-            )
-        
-        # Clean hex data
-        clean_hex = request.hex_data.replace("0x", "").replace(" ", "").replace("\n", "").replace(",", "")
+        # Clean hex data: one translate pass for separators, then "0x" prefixes if any
+        clean_hex = hex_data.translate(_HEX_SEPARATORS)
+        if "0x" in clean_hex:
+            clean_hex = clean_hex.replace("0x", "")
         data_bytes = bytes.fromhex(clean_hex)
         
         # Try to decode
         decoded = None
-        decoded_type = request.type_name or "Unknown"
-        
-        types_to_try = [request.type_name] if request.type_name else list(compiler.types.keys())
+        decoded_type = type_name or "Unknown"
         
-        for type_name in types_to_try:
+        for candidate in types_to_try:
             try:
-                decoded = compiler.decode(type_name, data_bytes, check_constraints=True)
-                decoded_type = type_name
+                decoded = compiler.decode(candidate, data_bytes, check_constraints=True)
+                decoded_type = candidate
                 break
             except Exception:
                 continue
@@ -563,28 +704,8 @@ async def decode_hex_to_message(request: HexDecodeRequest):
                 error="Could not decode against any type"
             )
         
-        # Determine message direction based on type
-        source_actor = request.source_actor
-        target_actor = request.target_actor
-        
         # Auto-detect direction for common RRC messages
-        ue_to_gnb_types = [
-            'RRCSetupRequest', 'RRCSetupComplete', 'RRCReconfigurationComplete',
-            'MeasurementReport', 'SecurityModeComplete', 'UECapabilityInformation',
-            'RRCConnectionRequest', 'RRCConnectionSetupComplete'
-        ]
-        gnb_to_ue_types = [
-            'RRCSetup', 'RRCReconfiguration', 'RRCRelease',
-            'SecurityModeCommand', 'UECapabilityEnquiry',
-            'RRCConnectionSetup', 'RRCConnectionReconfiguration', 'RRCConnectionRelease'
-        ]
-        
-        if decoded_type in ue_to_gnb_types:
-            source_actor = "UE"
-            target_actor = "gNB"
-        elif decoded_type in gnb_to_ue_types:
-            source_actor = "gNB"
-            target_actor = "UE"
+        source_actor, target_actor = _MESSAGE_DIRECTIONS.get(decoded_type, (source_actor, target_actor))
         
         return DecodedMessageResponse(
             type_name=decoded_type,
@@ -597,41 +718,152 @@ async def decode_hex_to_message(request: HexDecodeRequest):
         
     except ValueError as e:
         return DecodedMessageResponse(
-            type_name=request.type_name or "Unknown",
+            type_name=type_name or "Unknown",
             data={},
-            hex=request.hex_data,
+            hex=hex_data,
             status="error",
             error=f"Invalid hex format: {str(e)}"
         )
     except Exception as e:
         return DecodedMessageResponse(
-            type_name=request.type_name or "Unknown",
+            type_name=type_name or "Unknown",
             data={},
-            hex=request.hex_data,
+            hex=hex_data,
             status="error",
             error=f"Decode error: {str(e)}"
         )
 
 
-@router.post("/decode-hex-batch", response_model=List[DecodedMessageResponse])
-async def decode_hex_batch(request: BatchHexDecodeRequest):
-    """Decode multiple hex strings to MSC messages."""
-    results = []
+def _protocol_not_found(protocol: str, hex_data: str, type_name: Optional[str]) -> DecodedMessageResponse:
+    return DecodedMessageResponse(
+        type_name=type_name or "Unknown",
+        data={},
+        hex=hex_data,
+        status="error",
+        error=f"Protocol '{protocol}' not found"
+    )
+
+
+def _decode_batch(protocol: str, type_name: Optional[str], hex_messages: List[str]) -> List[DecodedMessageResponse]:
+    """Decode a list of hex messages, resolving the compiler and candidate types once."""
+    from backend.core.manager import manager
+    
+    compiler = manager.get_compiler(protocol)
+    if not compiler:
+        return [_protocol_not_found(protocol, hex_msg, type_name) for hex_msg in hex_messages]
+    # Type names are cached by the manager for each protocol load
+    types_to_try = (type_name,) if type_name else manager.get_type_names(protocol)
+    return [
+        _decode_one(compiler, types_to_try, hex_msg, type_name)
+        for hex_msg in hex_messages
+    ]
+
+
+# Compilers a pool worker has built, by protocol: (manager generation, compiler)
+_worker_compilers: Dict[str, Tuple[int, Any]] = {}
+
+
+def _decode_chunk(
+    protocol: str, generation: int, source_files: Tuple[str, ...],
+    types_to_try: Tuple[str, ...], type_name: Optional[str], hex_messages: List[str]
+) -> List[DecodedMessageResponse]:
+    """Decode a chunk in a pool worker, compiling only its protocol, once per generation."""
+    cached = _worker_compilers.get(protocol)
+    if cached is None or cached[0] != generation:
+        cached = (generation, asn1tools.compile_files(list(source_files), codec='per'))
+        _worker_compilers[protocol] = cached
+    compiler = cached[1]
+    return [_decode_one(compiler, types_to_try, hex_msg, type_name) for hex_msg in hex_messages]
+
+
+def _batch_inputs(protocol: str, type_name: Optional[str]) -> Optional[Tuple[int, Tuple[str, ...], Tuple[str, ...]]]:
+    """Generation, spec files and candidate types a worker needs; None if the protocol isn't loaded."""
+    from backend.core.manager import manager
     
-    for hex_msg in request.hex_messages:
-        single_request = HexDecodeRequest(
-            hex_data=hex_msg,
-            protocol=request.protocol,
-            type_name=request.type_name,
-            encoding_rule=request.encoding_rule
+    # Read the generation first: files from a newer load only make a worker recompile early
+    generation = manager.get_generation()
+    source_files = manager.get_source_files(protocol)
+    if source_files is None or manager.get_compiler(protocol) is None:
+        return None
+    types_to_try = (type_name,) if type_name else manager.get_type_names(protocol)
+    return generation, source_files, types_to_try
+
+
+# PER decoding is pure Python and holds the GIL, so batches of at least this many
+# messages are split into chunks and decoded in worker processes. Workers are spawned
+# (never forked, which could copy a held manager lock) and compile a protocol the
+# first time a chunk of it arrives, and again only after it reloads, so the pool
+# lives across reloads and small batches stay in-process.
+_PARALLEL_BATCH_MIN = 256
+_BATCH_CHUNK_SIZE = 32
+_DECODE_WORKERS = min(4, os.cpu_count() or 1)
+_decode_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_decode_pool() -> ProcessPoolExecutor:
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = ProcessPoolExecutor(
+            max_workers=_DECODE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
         )
-        result = await decode_hex_to_message(single_request)
-        results.append(result)
+    return _decode_pool
+
+
+def shutdown_decode_pool() -> None:
+    global _decode_pool
+    if _decode_pool is not None:
+        _decode_pool.shutdown(cancel_futures=True)
+        _decode_pool = None
+
+
+async def _decode_request(request: HexDecodeRequest) -> DecodedMessageResponse:
+    from backend.core.manager import manager
     
-    return results
+    compiler = manager.get_compiler(request.protocol)
+    if not compiler:
+        return _protocol_not_found(request.protocol, request.hex_data, request.type_name)
+    types_to_try = (request.type_name,) if request.type_name else manager.get_type_names(request.protocol)
+    # Decoding is CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(
+        _decode_one, compiler, types_to_try, request.hex_data, request.type_name,
+        request.source_actor, request.target_actor
+    )
+
+
+@router.post("/decode-hex", response_model=None, responses={200: {"model": DecodedMessageResponse}})
+async def decode_hex_to_message(request: HexDecodeRequest):
+    """Decode a single hex string to an MSC message."""
+    return model_json_response(await _decode_request(request))
 
 
-@router.post("/sequences/{sequence_id}/add-from-hex", response_model=SequenceResponse)
+@router.post("/decode-hex-batch", response_model=None, responses={200: {"model": List[DecodedMessageResponse]}})
+async def decode_hex_batch(request: BatchHexDecodeRequest):
+    """Decode multiple hex strings to MSC messages."""
+    messages = request.hex_messages
+    if len(messages) < _PARALLEL_BATCH_MIN:
+        return model_json_response(await asyncio.to_thread(_decode_batch, request.protocol, request.type_name, messages))
+    
+    inputs = await asyncio.to_thread(_batch_inputs, request.protocol, request.type_name)
+    if inputs is None:
+        return model_json_response(await asyncio.to_thread(_decode_batch, request.protocol, request.type_name, messages))
+    
+    loop = asyncio.get_running_loop()
+    pool = _get_decode_pool()
+    slices = [messages[i:i + _BATCH_CHUNK_SIZE] for i in range(0, len(messages), _BATCH_CHUNK_SIZE)]
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(pool, _decode_chunk, request.protocol, *inputs, request.type_name, chunk)
+        for chunk in slices
+    ), return_exceptions=True)
+    # A worker that can't compile the current files (e.g. a broken edit while the
+    # manager keeps the previous compiler) leaves its chunk to the in-process path
+    for index, chunk in enumerate(chunks):
+        if isinstance(chunk, Exception):
+            chunks[index] = await asyncio.to_thread(_decode_batch, request.protocol, request.type_name, slices[index])
+    return model_json_response([result for chunk in chunks for result in chunk])
+
+
+@router.post("/sequences/{sequence_id}/add-from-hex", response_model=None, responses={200: {"model": SequenceResponse}})
 async def add_message_from_hex(
     sequence_id: str,
     request: HexDecodeRequest,
@@ -639,7 +871,7 @@ async def add_message_from_hex(
 ):
     """Decode hex and add the resulting message to a sequence."""
     # First decode the hex
-    decoded = await decode_hex_to_message(request)
+    decoded = await _decode_request(request)
     
     if decoded.status != "success":
         raise HTTPException(status_code=400, detail=decoded.error or "Failed to decode hex")
@@ -653,7 +885,7 @@ async def add_message_from_hex(
     }
     
     dto = msc_service.add_message_to_sequence(sequence_id, message_data)
-    return build_sequence_response(dto)
+    return FastJSONResponse(build_sequence_response(dto))
 
 # Session Management Endpoints
 
@@ -669,7 +901,17 @@ class SessionResponse(CamelModel):
     updated_at: str
     is_active: bool
 
-@router.post("/sessions", response_model=SessionResponse)
+def build_session_response(session: MscSession) -> SessionResponse:
+    return SessionResponse.model_construct(
+        id=session.id,
+        name=session.name,
+        description=session.description,
+        created_at=session.created_at.isoformat(),
+        updated_at=session.updated_at.isoformat(),
+        is_active=session.is_active
+    )
+
+@router.post("/sessions", response_model=None, responses={200: {"model": SessionResponse}})
 async def create_session(
     request: SessionRequest,
     msc_service: MscApplicationService = Depends(get_msc_service)
@@ -677,39 +919,22 @@ async def create_session(
     """Create a new session."""
     try:
         session = msc_service.create_session(request.name, request.description)
-        return SessionResponse(
-            id=session.id,
-            name=session.name,
-            description=session.description,
-            created_at=session.created_at.isoformat(),
-            updated_at=session.updated_at.isoformat(),
-            is_active=session.is_active
-        )
+        return model_json_response(build_session_response(session))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
-@router.get("/sessions", response_model=List[SessionResponse])
+@router.get("/sessions", response_model=None, responses={200: {"model": List[SessionResponse]}})
 async def list_sessions(
     msc_service: MscApplicationService = Depends(get_msc_service)
 ):
     """List all sessions."""
     try:
         sessions = msc_service.list_sessions()
-        return [
-            SessionResponse(
-                id=session.id,
-                name=session.name,
-                description=session.description,
-                created_at=session.created_at.isoformat(),
-                updated_at=session.updated_at.isoformat(),
-                is_active=session.is_active
-            )
-            for session in sessions
-        ]
+        return model_json_response([build_session_response(session) for session in sessions])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
 
-@router.get("/sessions/{session_id}", response_model=SessionResponse)
+@router.get("/sessions/{session_id}", response_model=None, responses={200: {"model": SessionResponse}})
 async def get_session(
     session_id: str,
     msc_service: MscApplicationService = Depends(get_msc_service)
@@ -719,20 +944,13 @@ async def get_session(
         session = msc_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        return SessionResponse(
-            id=session.id,
-            name=session.name,
-            description=session.description,
-            created_at=session.created_at.isoformat(),
-            updated_at=session.updated_at.isoformat(),
-            is_active=session.is_active
-        )
+        return model_json_response(build_session_response(session))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session: {str(e)}")
 
-@router.put("/sessions/{session_id}", response_model=SessionResponse)
+@router.put("/sessions/{session_id}", response_model=None, responses={200: {"model": SessionResponse}})
 async def update_session(
     session_id: str,
     request: SessionRequest,
@@ -741,14 +959,7 @@ async def update_session(
     """Update a session."""
     try:
         session = msc_service.update_session(session_id, request.name, request.description)
-        return SessionResponse(
-            id=session.id,
-            name=session.name,
-            description=session.description,
-            created_at=session.created_at.isoformat(),
-            updated_at=session.updated_at.isoformat(),
-            is_active=session.is_active
-        )
+        return model_json_response(build_session_response(session))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update session: {str(e)}")
 
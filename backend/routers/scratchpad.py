@@ -1,6 +1,12 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+import asyncio
+import codecs
 import os
+import threading
+import uuid
+from typing import Optional, Tuple
 from backend.core.config import config_manager
 
 router = APIRouter()
@@ -8,31 +14,134 @@ router = APIRouter()
 class ScratchpadRequest(BaseModel):
     content: str
 
+# (path, mtime_ns, size, content) of the last scratchpad read or written. Reused
+# while the file's stat still matches, so a GET after a save skips the disk read.
+_cache: Optional[Tuple[str, int, int, str]] = None
+# Saves share one temp file name, so they run one at a time
+_save_lock = threading.Lock()
+
 def _get_scratchpad_path() -> str:
     """Get the path to the scratchpad file."""
     path = config_manager.get_messages_path()
     return os.path.join(path, "_scratchpad.txt")
 
+def _read_scratchpad(filepath: str) -> str:
+    global _cache
+    try:
+        stat_result = os.stat(filepath)
+    except FileNotFoundError:
+        return ""
+    cached = _cache
+    if cached is not None and cached[:3] == (filepath, stat_result.st_mtime_ns, stat_result.st_size):
+        return cached[3]
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    _cache = (filepath, stat_result.st_mtime_ns, stat_result.st_size, content)
+    return content
+
+def _write_scratchpad(filepath: str, content: str) -> None:
+    global _cache
+    with _save_lock:
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # Write aside and rename over, so a concurrent GET never reads a partial file
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+        stat_result = os.stat(filepath)
+        _cache = (filepath, stat_result.st_mtime_ns, stat_result.st_size, content)
+
+def _open_upload(filepath: str) -> Tuple[str, int]:
+    """Create a uniquely named temp file next to the scratchpad for a streamed save."""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    return tmp_path, os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+
+def _write_chunk(fd: int, chunk: bytes) -> None:
+    view = memoryview(chunk)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _finish_upload(tmp_path: str, filepath: str) -> None:
+    global _cache
+    with _save_lock:
+        os.replace(tmp_path, filepath)
+        _cache = None  # The next GET reads the uploaded text back from disk
+
+def _declared_charset(content_type: str) -> str:
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            return value.strip().strip('"') or "utf-8"
+    return "utf-8"
+
+async def _stream_scratchpad(filepath: str, request: Request) -> None:
+    charset = _declared_charset(request.headers.get("content-type", ""))
+    try:
+        codec = codecs.lookup(charset)
+    except LookupError:
+        codec = None
+    # Bytes-to-bytes codecs (base64, zlib, ...) are not charsets
+    if codec is None or not getattr(codec, '_is_text_encoding', True):
+        raise HTTPException(400, f"Unsupported charset: {charset}")
+    decoder = codec.incrementaldecoder()
+    tmp_path, fd = await asyncio.to_thread(_open_upload, filepath)
+    try:
+        try:
+            # Decode as it arrives so the stored file is always valid UTF-8,
+            # which is what _read_scratchpad expects
+            async for chunk in request.stream():
+                text = decoder.decode(chunk)
+                if text:
+                    await asyncio.to_thread(_write_chunk, fd, text.encode('utf-8'))
+            text = decoder.decode(b"", final=True)
+            if text:
+                await asyncio.to_thread(_write_chunk, fd, text.encode('utf-8'))
+        except UnicodeDecodeError:
+            raise HTTPException(400, f"Scratchpad text is not valid {charset}")
+        finally:
+            os.close(fd)
+        await asyncio.to_thread(_finish_upload, tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
 @router.get("")
 async def get_scratchpad():
     """Get scratchpad content."""
-    filepath = _get_scratchpad_path()
-    if not os.path.exists(filepath):
-        return {"content": ""}
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return {"content": f.read()}
+        return {"content": await asyncio.to_thread(_read_scratchpad, _get_scratchpad_path())}
     except Exception:
         return {"content": ""}
 
-@router.put("")
-async def save_scratchpad(req: ScratchpadRequest):
-    """Save scratchpad content."""
+# The body is read by hand so text/plain can be streamed; document both forms
+_SAVE_BODY = {
+    "required": True,
+    "content": {
+        "text/plain": {"schema": {"type": "string"}},
+        "application/json": {"schema": ScratchpadRequest.model_json_schema()},
+    },
+}
+
+@router.put("", openapi_extra={"requestBody": _SAVE_BODY})
+async def save_scratchpad(request: Request):
+    """Save scratchpad content.
+
+    A text/plain body is streamed straight to disk; the JSON form {"content": ...}
+    is still accepted.
+    """
     filepath = _get_scratchpad_path()
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(req.content)
-    
+    if request.headers.get("content-type", "").startswith("text/plain"):
+        await _stream_scratchpad(filepath, request)
+        return {"status": "success"}
+
+    try:
+        req = ScratchpadRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    await asyncio.to_thread(_write_scratchpad, filepath, req.content)
     return {"status": "success"}
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
+import asyncio
 import os
-import json
+import re
+import shutil
+import stat
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from operator import attrgetter
+from typing import IO, List, Optional, Set, Tuple
 from backend.core.config import config_manager
+from backend.core.responses import json_bytes_response, render_json
 
 router = APIRouter()
 
@@ -24,12 +30,43 @@ class UpdateSessionRequest(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
 
+# (path, directory mtime_ns, sessions, JSON body) of the last listing. Adding or removing
+# a session folder bumps the directory mtime; metadata writes and deletes also reset it.
+_list_cache: Optional[Tuple[str, int, List[Session], bytes]] = None
+
+def _invalidate_listing() -> None:
+    global _list_cache
+    _list_cache = None
+
+# Folders this process has already created, so writes skip os.makedirs after the first.
+# Entries for a session are dropped when it is deleted.
+_ensured_dirs: Set[str] = set()
+
+def _ensure_dir(path: str) -> None:
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+def _open_for_write(dir_path: str, filename: str, mode: str, **kwargs) -> IO:
+    """Open dir_path/filename for writing, creating dir_path if needed."""
+    _ensure_dir(dir_path)
+    filepath = os.path.join(dir_path, filename)
+    try:
+        return open(filepath, mode, **kwargs)
+    except FileNotFoundError:
+        # The folder was removed outside this process; create it again
+        _ensured_dirs.discard(dir_path)
+        _ensure_dir(dir_path)
+        return open(filepath, mode, **kwargs)
+
 def _get_sessions_path() -> str:
-    """Get the base path for user sessions."""
+    """Get the base path for user sessions.
+
+    Not created here: readers treat a missing folder as empty, and every writer
+    creates the session folder it writes into.
+    """
     base = config_manager.get_messages_path()
-    sessions_path = os.path.join(os.path.dirname(base), "sessions")
-    os.makedirs(sessions_path, exist_ok=True)
-    return sessions_path
+    return os.path.join(os.path.dirname(base), "sessions")
 
 def _get_session_path(session_id: str) -> str:
     """Get path for a specific session."""
@@ -42,70 +79,89 @@ def _get_session_meta_path(session_id: str) -> str:
 def _load_session(session_id: str) -> Optional[Session]:
     """Load session metadata."""
     meta_path = _get_session_meta_path(session_id)
-    if not os.path.exists(meta_path):
-        return None
     try:
-        with open(meta_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return Session(**data)
+        with open(meta_path, 'rb') as f:
+            # Validated straight from the bytes; a malformed file is skipped
+            return Session.model_validate_json(f.read())
     except Exception:
         return None
 
 def _save_session(session: Session):
     """Save session metadata."""
-    session_path = _get_session_path(session.id)
-    os.makedirs(session_path, exist_ok=True)
-    
-    meta_path = _get_session_meta_path(session.id)
-    with open(meta_path, 'w', encoding='utf-8') as f:
-        json.dump(session.model_dump(), f, indent=2)
+    with _open_for_write(_get_session_path(session.id), "_session.json", 'wb') as f:
+        f.write(render_json(session.model_dump(), indent=config_manager.get().pretty_json))
+    _invalidate_listing()
 
-def _ensure_default_session():
-    """Ensure a default session exists."""
-    sessions = _list_sessions()
-    if not sessions:
+def _ensure_default_session() -> Tuple[List[Session], bytes]:
+    """Ensure a default session exists and return the session listing."""
+    listing = _session_listing()
+    if not listing[0]:
         # Create default session
+        now = datetime.now().isoformat()
         session = Session(
             id="default",
             name="Default Session",
             description="Default working session",
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
+            created_at=now,
+            updated_at=now
         )
         _save_session(session)
-        return session
-    return None
+        return _session_listing()
+    return listing
 
-def _list_sessions() -> List[Session]:
-    """List all sessions."""
+def _session_listing() -> Tuple[List[Session], bytes]:
+    """All sessions, oldest first, plus the same list serialized as a JSON array.
+
+    Both are shared with the cache, so callers must not modify the list.
+    """
+    global _list_cache
     sessions_path = _get_sessions_path()
+    try:
+        mtime = os.stat(sessions_path).st_mtime_ns
+    except FileNotFoundError:
+        return [], b"[]"
+    cached = _list_cache
+    if cached is not None and cached[0] == sessions_path and cached[1] == mtime:
+        return cached[2], cached[3]
     sessions = []
     
-    if os.path.exists(sessions_path):
-        for item in os.listdir(sessions_path):
-            item_path = os.path.join(sessions_path, item)
-            if os.path.isdir(item_path):
-                session = _load_session(item)
+    # scandir yields the entry type with each name, so no extra stat per entry
+    try:
+        with os.scandir(sessions_path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_dir(follow_symlinks=False):
+                    continue
+                session = _load_session(entry.name)
                 if session:
                     sessions.append(session)
+    except FileNotFoundError:
+        pass
     
-    return sorted(sessions, key=lambda s: s.created_at)
+    sessions.sort(key=attrgetter('created_at'))
+    body = render_json([s.model_dump() for s in sessions])
+    _list_cache = (sessions_path, mtime, sessions, body)
+    return sessions, body
 
-@router.get("")
-async def list_sessions() -> List[Session]:
+def _list_sessions() -> List[Session]:
+    """List all sessions."""
+    return list(_session_listing()[0])
+
+@router.get("", response_model=None, responses={200: {"model": List[Session]}})
+async def list_sessions():
     """List all user sessions."""
-    _ensure_default_session()
-    return _list_sessions()
+    # The serialized listing is cached with the sessions, so it is sent as-is
+    return json_bytes_response(_ensure_default_session()[1])
 
 @router.post("")
 async def create_session(req: CreateSessionRequest) -> Session:
     """Create a new session."""
+    now = datetime.now().isoformat()
     session = Session(
-        id=str(uuid.uuid4())[:8],
+        id=uuid.uuid4().hex[:8],
         name=req.name,
         description=req.description or "",
-        created_at=datetime.now().isoformat(),
-        updated_at=datetime.now().isoformat()
+        created_at=now,
+        updated_at=now
     )
     _save_session(session)
     return session
@@ -146,8 +202,16 @@ async def delete_session(session_id: str):
     if len(sessions) <= 1:
         raise HTTPException(400, "Cannot delete the last session")
     
-    import shutil
-    shutil.rmtree(session_path)
+    try:
+        shutil.rmtree(session_path)
+    except FileNotFoundError:
+        # Removed by a concurrent delete after the check above
+        raise HTTPException(404, "Session not found")
+    except OSError as e:
+        raise HTTPException(500, f"Failed to delete: {e}")
+    finally:
+        _invalidate_listing()
+        _ensured_dirs.difference_update((session_path, os.path.join(session_path, "messages")))
     return {"status": "success"}
 
 # Session-scoped data endpoints
@@ -156,8 +220,6 @@ async def delete_session(session_id: str):
 async def get_session_scratchpad(session_id: str):
     """Get scratchpad for a session."""
     filepath = os.path.join(_get_session_path(session_id), "scratchpad.txt")
-    if not os.path.exists(filepath):
-        return {"content": ""}
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             return {"content": f.read()}
@@ -167,66 +229,105 @@ async def get_session_scratchpad(session_id: str):
 @router.put("/{session_id}/scratchpad")
 async def save_session_scratchpad(session_id: str, req: dict):
     """Save scratchpad for a session."""
-    session_path = _get_session_path(session_id)
-    os.makedirs(session_path, exist_ok=True)
-    
-    filepath = os.path.join(session_path, "scratchpad.txt")
-    with open(filepath, 'w', encoding='utf-8') as f:
+    with _open_for_write(_get_session_path(session_id), "scratchpad.txt", 'w', encoding='utf-8') as f:
         f.write(req.get("content", ""))
     
     return {"status": "success"}
 
+# Path separators anywhere, or a leading dot (hidden files and ".."), as for saved messages
+_INVALID_MESSAGE_NAME = re.compile(r"[\\/]|\A\.")
+
+def _check_message_name(filename: str) -> None:
+    """Reject message filenames that would resolve outside the session's messages folder."""
+    if _INVALID_MESSAGE_NAME.search(filename):
+        raise HTTPException(400, "Invalid filename")
+
 @router.get("/{session_id}/messages")
 async def list_session_messages(session_id: str) -> List[str]:
     """List saved messages for a session."""
     messages_path = os.path.join(_get_session_path(session_id), "messages")
-    if not os.path.exists(messages_path):
+    try:
+        with os.scandir(messages_path) as entries:
+            names = [e.name for e in entries if e.name.endswith('.json') and not e.name.startswith('.') and e.is_file()]
+    except FileNotFoundError:
         return []
-    
-    import glob
-    files = sorted(glob.glob(os.path.join(messages_path, "*.json")))
-    return [os.path.basename(f) for f in files]
+    names.sort()
+    return names
 
 @router.post("/{session_id}/messages")
 async def save_session_message(session_id: str, req: dict):
     """Save a message to a session."""
     messages_path = os.path.join(_get_session_path(session_id), "messages")
-    os.makedirs(messages_path, exist_ok=True)
     
     filename = req.get("filename", "")
+    if not isinstance(filename, str):
+        raise HTTPException(400, "Invalid filename")
     if not filename.endswith('.json'):
         filename += '.json'
+    _check_message_name(filename)
     
-    filepath = os.path.join(messages_path, filename)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(req, f, indent=2)
+    with _open_for_write(messages_path, filename, 'wb') as f:
+        f.write(render_json(req, indent=config_manager.get().pretty_json))
     
     return {"status": "success", "filename": filename}
 
 @router.get("/{session_id}/messages/{filename}")
 async def get_session_message(session_id: str, filename: str):
     """Get a message from a session."""
+    _check_message_name(filename)
     filepath = os.path.join(_get_session_path(session_id), "messages", filename)
-    if not os.path.exists(filepath):
+    try:
+        stat_result = os.stat(filepath)
+    except FileNotFoundError:
         raise HTTPException(404, "Message not found")
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(404, "Message not found")
+    # Files are written by save_session_message, so send the stored JSON as-is
+    return FileResponse(filepath, media_type="application/json", stat_result=stat_result)
 
 @router.delete("/{session_id}/messages/{filename}")
 async def delete_session_message(session_id: str, filename: str):
     """Delete a message from a session."""
+    _check_message_name(filename)
     filepath = os.path.join(_get_session_path(session_id), "messages", filename)
-    if os.path.exists(filepath):
+    try:
         os.remove(filepath)
+    except FileNotFoundError:
+        pass
     return {"status": "success"}
 
+# Below this many files, clearing runs serially in one worker thread
+_PARALLEL_CLEAR_MIN = 64
+
+def _message_paths(messages_path: str) -> List[str]:
+    try:
+        with os.scandir(messages_path) as entries:
+            return [entry.path for entry in entries if entry.name.endswith('.json') and not entry.name.startswith('.')]
+    except FileNotFoundError:
+        return []
+
+def _remove_paths(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
 @router.delete("/{session_id}/messages")
 async def clear_session_messages(session_id: str):
     """Clear all messages in a session."""
     messages_path = os.path.join(_get_session_path(session_id), "messages")
-    if os.path.exists(messages_path):
-        import glob
-        for f in glob.glob(os.path.join(messages_path, "*.json")):
-            os.remove(f)
+    paths = await asyncio.to_thread(_message_paths, messages_path)
+    try:
+        if len(paths) > _PARALLEL_CLEAR_MIN:
+            # Overlap the unlinks, which pays off on slow or network storage
+            results = await asyncio.gather(*(asyncio.to_thread(os.unlink, p) for p in paths), return_exceptions=True)
+            for result in results:
+                # Files already gone (e.g. a concurrent delete) are fine
+                if isinstance(result, Exception) and not isinstance(result, FileNotFoundError):
+                    raise result
+        else:
+            await asyncio.to_thread(_remove_paths, paths)
+    except OSError as e:
+        raise HTTPException(500, f"Failed to clear: {e}")
     return {"status": "success"}
@@ -12,13 +12,15 @@ PORT = 8000
 
 
 def is_port_in_use(host: str, port: int) -> bool:
-    """Check if a port is already in use."""
+    """Check if a server is already listening on the port.
+
+    Probes with connect() rather than bind(): a test bind can be refused by
+    sockets lingering in TIME_WAIT, which uvicorn's own bind (SO_REUSEADDR)
+    would not be.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        try:
-            s.bind((host, port))
-            return False
-        except OSError:
-            return True
+        s.settimeout(0.1)
+        return s.connect_ex((host, port)) == 0
 
 
 def main():
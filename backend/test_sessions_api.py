@@ -6,6 +6,9 @@ BASE_URL = "http://localhost:8000"
 
 def test_api():
     errors = []
+    # One pooled session, so every call reuses the same keep-alive connection
+    http = requests.Session()
+    http.headers['Accept'] = 'application/json'
     
     print("=" * 60)
     print("SESSIONS API TEST")
@@ -14,7 +17,7 @@ def test_api():
     # 1. List sessions (should have default)
     print("\n1. List sessions...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions")
+        res = http.get(f"{BASE_URL}/api/sessions")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         sessions = res.json()
         assert isinstance(sessions, list), "Expected list"
@@ -30,7 +33,7 @@ def test_api():
     print("\n2. Create new session...")
     new_session_id = None
     try:
-        res = requests.post(f"{BASE_URL}/api/sessions", json={
+        res = http.post(f"{BASE_URL}/api/sessions", json={
             "name": "Test Session",
             "description": "Created by test script"
         })
@@ -46,7 +49,7 @@ def test_api():
     # 3. Get session by ID
     print("\n3. Get session by ID...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         session = res.json()
         assert session['id'] == new_session_id
@@ -58,7 +61,7 @@ def test_api():
     # 4. Update session
     print("\n4. Update session...")
     try:
-        res = requests.put(f"{BASE_URL}/api/sessions/{new_session_id}", json={
+        res = http.put(f"{BASE_URL}/api/sessions/{new_session_id}", json={
             "name": "Test Session Updated",
             "description": "Updated by test"
         })
@@ -74,7 +77,7 @@ def test_api():
     print("\n5. Save scratchpad to session...")
     try:
         test_content = "Hello from test script!\nLine 2\nLine 3"
-        res = requests.put(f"{BASE_URL}/api/sessions/{new_session_id}/scratchpad", json={
+        res = http.put(f"{BASE_URL}/api/sessions/{new_session_id}/scratchpad", json={
             "content": test_content
         })
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
@@ -86,7 +89,7 @@ def test_api():
     # 6. Load scratchpad from session
     print("\n6. Load scratchpad from session...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}/scratchpad")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}/scratchpad")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         data = res.json()
         assert data['content'] == test_content, "Content mismatch"
@@ -98,7 +101,7 @@ def test_api():
     # 7. Save message to session
     print("\n7. Save message to session...")
     try:
-        res = requests.post(f"{BASE_URL}/api/sessions/{new_session_id}/messages", json={
+        res = http.post(f"{BASE_URL}/api/sessions/{new_session_id}/messages", json={
             "filename": "test_message",
             "protocol": "rrc_demo",
             "type": "RRCConnectionRequest",
@@ -113,7 +116,7 @@ def test_api():
     # 8. List messages in session
     print("\n8. List messages in session...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         messages = res.json()
         assert isinstance(messages, list)
@@ -126,7 +129,7 @@ def test_api():
     # 9. Get message from session
     print("\n9. Get message from session...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages/test_message.json")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages/test_message.json")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         msg = res.json()
         assert msg['protocol'] == "rrc_demo"
@@ -139,12 +142,12 @@ def test_api():
     # 10. Delete message from session
     print("\n10. Delete message from session...")
     try:
-        res = requests.delete(f"{BASE_URL}/api/sessions/{new_session_id}/messages/test_message.json")
+        res = http.delete(f"{BASE_URL}/api/sessions/{new_session_id}/messages/test_message.json")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         print("   ✓ Deleted message")
         
         # Verify deletion
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}/messages")
         messages = res.json()
         assert "test_message.json" not in messages
         print("   ✓ Verified deletion")
@@ -155,12 +158,12 @@ def test_api():
     # 11. Delete session
     print("\n11. Delete test session...")
     try:
-        res = requests.delete(f"{BASE_URL}/api/sessions/{new_session_id}")
+        res = http.delete(f"{BASE_URL}/api/sessions/{new_session_id}")
         assert res.status_code == 200, f"Expected 200, got {res.status_code}"
         print("   ✓ Deleted session")
         
         # Verify deletion
-        res = requests.get(f"{BASE_URL}/api/sessions/{new_session_id}")
+        res = http.get(f"{BASE_URL}/api/sessions/{new_session_id}")
         assert res.status_code == 404, "Session should be deleted"
         print("   ✓ Verified deletion (404)")
     except Exception as e:
@@ -170,10 +173,10 @@ def test_api():
     # 12. Cannot delete last session
     print("\n12. Test cannot delete last session...")
     try:
-        res = requests.get(f"{BASE_URL}/api/sessions")
+        res = http.get(f"{BASE_URL}/api/sessions")
         sessions = res.json()
         if len(sessions) == 1:
-            res = requests.delete(f"{BASE_URL}/api/sessions/{sessions[0]['id']}")
+            res = http.delete(f"{BASE_URL}/api/sessions/{sessions[0]['id']}")
             assert res.status_code == 400, f"Expected 400, got {res.status_code}"
             print("   ✓ Correctly prevented deletion of last session")
         else:
@@ -182,6 +185,8 @@ def test_api():
         errors.append(f"Delete last session test: {e}")
         print(f"   ✗ FAILED: {e}")
     
+    http.close()
+    
     # Summary
     print("\n" + "=" * 60)
     if errors:
@@ -5,12 +5,13 @@ import httpx
 
 from backend.main import app
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
     Returns a client for testing.
     If TEST_API_URL env var is set, returns an httpx.Client connected to that URL (Integration Test).
     Otherwise, returns a TestClient wrapping the local FastAPI app (Unit Test).
+    One client serves the whole run, so app startup happens once.
     """
     api_url = os.getenv("TEST_API_URL")
     
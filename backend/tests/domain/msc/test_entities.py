@@ -183,6 +183,18 @@ class TestMscSequence:
         assert removed is True
         assert len(sequence.messages) == 0
     
+    def test_is_empty(self):
+        sequence = MscSequence(protocol="rrc_demo")
+        assert sequence.is_empty
+        
+        message = MscMessage(type_name="Test")
+        sequence.add_message(message)
+        assert not sequence.is_empty
+        
+        sequence.remove_message(message.id)
+        sequence.sub_sequences.append(MscSequence(name="Child", protocol="rrc_demo"))
+        assert not sequence.is_empty
+    
     def test_remove_nonexistent_message(self):
         sequence = MscSequence(protocol="rrc_demo")
         removed = sequence.remove_message("nonexistent")
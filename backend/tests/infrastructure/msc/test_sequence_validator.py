@@ -0,0 +1,113 @@
+import pytest
+
+from backend.domain.msc.entities import MscSequence, MscMessage
+from backend.infrastructure.msc.configuration_tracker import ConfigurationTracker
+from backend.infrastructure.msc.sequence_validator import SequenceValidator
+
+@pytest.fixture
+def validator():
+    return SequenceValidator(ConfigurationTracker())
+
+def _codes(results):
+    return [r.code for r in results]
+
+class TestSequenceRules:
+    def test_unbalanced_communication(self, validator):
+        """Test that a one-directional sequence is flagged as unbalanced."""
+        sequence = MscSequence(
+            protocol="rrc_demo",
+            messages=[
+                MscMessage(type_name="RRCConnectionRequest", source_actor="UE", target_actor="gNB"),
+                MscMessage(type_name="MeasurementReport", source_actor="UE", target_actor="gNB"),
+            ]
+        )
+
+        results = validator._validate_sequence_rules(sequence)
+
+        assert "UNBALANCED_COMMUNICATION" in _codes(results)
+
+    def test_balanced_communication(self, validator):
+        """Test that alternating UE/gNB traffic is not flagged."""
+        sequence = MscSequence(
+            protocol="rrc_demo",
+            messages=[
+                MscMessage(type_name="RRCConnectionRequest", source_actor="UE", target_actor="gNB"),
+                MscMessage(type_name="RRCConnectionSetup", source_actor="gNB", target_actor="UE"),
+            ]
+        )
+
+        results = validator._validate_sequence_rules(sequence)
+
+        assert "UNBALANCED_COMMUNICATION" not in _codes(results)
+        assert "MISSING_CONNECTION_START" not in _codes(results)
+
+    def test_duplicate_consecutive_messages(self, validator):
+        """Test that repeated messages from the same actor are flagged at the second index."""
+        sequence = MscSequence(
+            protocol="rrc_demo",
+            messages=[
+                MscMessage(type_name="RRCConnectionRequest", source_actor="UE", target_actor="gNB"),
+                MscMessage(type_name="RRCConnectionSetup", source_actor="gNB", target_actor="UE"),
+                MscMessage(type_name="RRCConnectionSetup", source_actor="gNB", target_actor="UE"),
+            ]
+        )
+
+        results = validator._validate_sequence_rules(sequence)
+
+        duplicates = [r for r in results if r.code == "DUPLICATE_CONSECUTIVE_MESSAGES"]
+        assert [r.message_index for r in duplicates] == [2]
+
+class TestValidateSequence:
+    def test_compiler_resolved_once_per_sequence(self, validator, monkeypatch):
+        """Test that the protocol compiler is looked up once, not per message."""
+        from backend.core.manager import manager
+
+        calls = []
+        original = manager.get_compiler
+
+        def counting_get_compiler(protocol):
+            calls.append(protocol)
+            return original(protocol)
+
+        monkeypatch.setattr(manager, "get_compiler", counting_get_compiler)
+        sequence = MscSequence(
+            protocol="rrc_demo",
+            messages=[
+                MscMessage(type_name="RRCConnectionRequest", source_actor="UE", target_actor="gNB"),
+                MscMessage(type_name="NotARealType", source_actor="gNB", target_actor="UE"),
+                MscMessage(type_name="RRCConnectionSetup", source_actor="gNB", target_actor="UE"),
+            ]
+        )
+
+        results = validator.validate_sequence(sequence)
+
+        assert calls == ["rrc_demo"]
+        unknown = [r for r in results if r.code == "UNKNOWN_MESSAGE_TYPE"]
+        assert [r.message for r in unknown] == [
+            "Message type 'NotARealType' not found in protocol 'rrc_demo'",
+            "Message type 'RRCConnectionSetup' not found in protocol 'rrc_demo'",
+        ]
+
+class TestIdentifierConsistency:
+    def test_conflicting_values_grouped_by_message(self, validator):
+        """Test that each distinct identifier value is reported once with its message indices."""
+        sequence = MscSequence(protocol="rrc_demo")
+        sequence.add_message(MscMessage(type_name="RRCConnectionRequest", data={"ue-Identity": "A"}))
+        sequence.add_message(MscMessage(type_name="RRCConnectionSetup", data={"ue-Identity": "B"},
+                                        source_actor="gNB", target_actor="UE"))
+        sequence.add_message(MscMessage(type_name="RRCConnectionSetupComplete", data={"ue-Identity": "A"}))
+
+        results = validator._validate_identifier_consistency(sequence)
+
+        assert [r.message for r in results] == [
+            "Inconsistent 'ue-Identity': value 'A' used in messages [0, 2]",
+            "Inconsistent 'ue-Identity': value 'B' used in messages [1]",
+        ]
+
+    def test_consistent_values_not_reported(self, validator):
+        """Test that a repeated identical value produces no conflicts."""
+        sequence = MscSequence(protocol="rrc_demo")
+        sequence.add_message(MscMessage(type_name="RRCConnectionRequest", data={"ue-Identity": "A"}))
+        sequence.add_message(MscMessage(type_name="RRCConnectionSetupComplete", data={"ue-Identity": "A"}))
+
+        assert validator._validate_identifier_consistency(sequence) == []
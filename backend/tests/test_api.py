@@ -10,6 +10,58 @@ def test_health(client):
     data = response.json()
     assert data["status"] == "ok"
     assert data["version"] == "0.3.1"
+    assert isinstance(data["warmed_up"], bool)
+
+def test_startup_warms_protocols(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend import main
+    from backend.core.manager import AsnManager
+    
+    # A fresh manager: importing it compiles nothing, so only the startup hook can
+    fresh = AsnManager()
+    monkeypatch.setattr(main, "manager", fresh)
+    assert fresh.generation == 0 and not fresh.compilers
+    
+    with TestClient(main.app):
+        task = main.app.state.warmup_task
+    # Shutdown waits for the warm-up, which leaves the protocols compiled
+    assert task.done() and task.exception() is None
+    assert fresh.generation == 1
+    assert "rrc_demo" in fresh.compilers
+
+def test_requests_during_warmup_do_not_block_the_loop(monkeypatch):
+    import threading
+    import time
+    from fastapi.testclient import TestClient
+    from backend import main
+    from backend.core.manager import manager
+    
+    # A slow first compile that holds the manager lock, as the real one does
+    def slow_ensure_loaded():
+        with manager._lock:
+            time.sleep(1.5)
+            manager._ensure_latest_locked()
+    monkeypatch.setattr(manager, "ensure_loaded", slow_ensure_loaded)
+    
+    with TestClient(main.app) as warming_client:
+        results = {}
+        def fetch_protocols():
+            results["protocols"] = warming_client.get("/api/asn/protocols")
+        worker = threading.Thread(target=fetch_protocols)
+        worker.start()
+        time.sleep(0.3)
+        
+        started = time.monotonic()
+        health = warming_client.get("/health")
+        elapsed = time.monotonic() - started
+        worker.join()
+    
+    # /health answers while the protocols request is still waiting for the warm-up
+    assert health.status_code == 200
+    assert health.json()["warmed_up"] is False
+    assert elapsed < 0.8
+    assert results["protocols"].status_code == 200
+    assert "rrc_demo" in results["protocols"].json()
 
 def test_list_protocols(client):
     response = client.get("/api/asn/protocols")
@@ -81,3 +133,55 @@ def test_encode_constraint_fail(client):
     assert response.status_code == 200
     assert response.json()["status"] == "failure"
     assert "Validation Error" in response.json()["error"]
+
+def test_decode_repeated_request_is_memoised(client):
+    from backend.routers import asn
+
+    payload = {
+        "hex_data": "8200416c6963653c",
+        "protocol": "simple_demo",
+        "type_name": "Person",
+        "encoding_rule": "per"
+    }
+    asn._decode_payload.cache_clear()
+    first = client.post("/api/asn/decode", json=payload)
+    second = client.post("/api/asn/decode", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert asn._decode_payload.cache_info().hits >= 1
+
+def test_trace_cache_holds_only_small_payloads(client):
+    from backend.routers import asn
+
+    payload = {
+        "hex_data": "8200416c6963653c",
+        "protocol": "simple_demo",
+        "type_name": "Person",
+        "encoding_rule": "per"
+    }
+    asn._trace_json.cache_clear()
+    first = client.post("/api/asn/trace", json=payload)
+    second = client.post("/api/asn/trace", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["status"] == "success"
+    assert first.json() == second.json()
+    assert asn._trace_json.cache_info().hits == 1
+
+    # Oversize payloads are traced without being cached
+    large = dict(payload, hex_data=payload["hex_data"] + "00" * asn._TRACE_CACHE_MAX_HEX)
+    assert client.post("/api/asn/trace", json=large).status_code == 200
+    assert asn._trace_json.cache_info().currsize == 1
+
+def test_protocol_list_rebuilt_per_generation(client, monkeypatch):
+    from backend.core.manager import manager
+
+    first = client.get("/api/asn/protocols")
+    monkeypatch.setattr(manager, "generation", manager.generation + 1)
+    monkeypatch.setattr(manager, "list_protocols", lambda: ["only_this"])
+    second = client.get("/api/asn/protocols")
+
+    assert first.headers["content-type"] == "application/json"
+    assert "simple_demo" in first.json()
+    assert second.json() == ["only_this"]
@@ -83,3 +83,14 @@ def test_generate_c_stubs_success(mock_glob, mock_exists, mock_makedirs, mock_zi
 def test_generate_c_stubs_invalid_protocol(codegen_service):
     with pytest.raises(ValueError, match="Protocol 'bad_proto' not found"):
         codegen_service.generate_c_stubs("bad_proto", [])
+
+def test_codegen_endpoint_removes_zip_after_response(client, tmp_path):
+    zip_path = tmp_path / "test_proto_1234.zip"
+    zip_path.write_bytes(b"PK\x05\x06" + b"\x00" * 18)
+
+    with patch("backend.routers.asn.codegen_service.generate_c_stubs", return_value=str(zip_path)):
+        response = client.post("/api/asn/codegen", json={"protocol": "test_proto", "types": []})
+
+    assert response.status_code == 200
+    assert response.content == b"PK\x05\x06" + b"\x00" * 18
+    assert not zip_path.exists()
@@ -5,6 +5,7 @@ Tests for lower coverage modules:
 - rrc_state_machine.py (35%)
 - configuration_tracker.py (41%)
 - scratchpad.py (44%)
+- sessions.py
 """
 import os
 import sys
@@ -82,6 +83,15 @@ class TestMessagesRouter:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
     
+    def test_list_messages_tracks_changes(self, client):
+        """Test that the cached listing picks up saves and deletes."""
+        client.get("/api/messages")
+        client.post("/api/messages", json={"filename": "listed_msg", "protocol": "test", "type": "Test", "data": {}})
+        assert "listed_msg.json" in client.get("/api/messages").json()
+        
+        client.delete("/api/messages/listed_msg.json")
+        assert "listed_msg.json" not in client.get("/api/messages").json()
+    
     def test_save_and_load_message(self, client):
         """Test saving and loading a message."""
         # Save a message
@@ -131,6 +141,92 @@ class TestMessagesRouter:
         response = client.get("/api/messages/nonexistent_12345.json")
         assert response.status_code == 404
     
+    def test_conditional_requests_return_not_modified(self, client):
+        """Test that unchanged listings and messages answer If-None-Match with 304."""
+        client.post("/api/messages", json={"filename": "etag_msg", "protocol": "test", "type": "Test", "data": {}})
+        
+        listing = client.get("/api/messages")
+        assert client.get("/api/messages", headers={"If-None-Match": listing.headers["etag"]}).status_code == 304
+        
+        loaded = client.get("/api/messages/etag_msg.json")
+        cached = client.get("/api/messages/etag_msg.json", headers={"If-None-Match": loaded.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        
+        client.delete("/api/messages/etag_msg.json")
+        assert client.get("/api/messages", headers={"If-None-Match": listing.headers["etag"]}).status_code == 200
+    
+    def test_write_bytes_replaces_atomically(self, tmp_path):
+        """Test that saving over a message leaves no temp files behind."""
+        from backend.routers.messages import _write_bytes
+        
+        target = tmp_path / "msgs" / "m.json"
+        _write_bytes(str(target.parent), str(target), b'{"old": true}')
+        _write_bytes(str(target.parent), str(target), b'{"new": true}')
+        
+        assert target.read_bytes() == b'{"new": true}'
+        assert [p.name for p in target.parent.iterdir()] == ["m.json"]
+    
+    def test_bulk_save_reports_each_message(self, client):
+        """Test that bulk save writes valid messages and reports invalid names per item."""
+        response = client.post("/api/messages/bulk", json={"messages": [
+            {"filename": "bulk_a", "protocol": "test", "type": "Test", "data": {"n": 1}},
+            {"filename": "../bulk_b", "protocol": "test", "type": "Test", "data": {}},
+        ]})
+        assert response.status_code == 200
+        assert response.json()["status"] == "partial"
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["success", "failure"]
+        assert client.get("/api/messages/bulk_a.json").json()["data"] == {"n": 1}
+        assert "bulk_a.json" in client.get("/api/messages").json()
+        
+        client.delete("/api/messages/bulk_a.json")
+    
+    def test_bulk_save_reports_failure_when_nothing_is_saved(self, client):
+        """Test that a batch of only invalid messages is a failure at the top level."""
+        response = client.post("/api/messages/bulk", json={"messages": [
+            {"filename": "../bulk_c", "protocol": "test", "type": "Test", "data": {}},
+            {"filename": "..\\bulk_d", "protocol": "test", "type": "Test", "data": {}},
+        ]})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "failure"
+        assert [r["status"] for r in body["results"]] == ["failure", "failure"]
+        assert "bulk_c.json" not in client.get("/api/messages").json()
+    
+    def test_saved_message_etag_follows_content(self, client):
+        """Test that messages written by the API carry a content-hash ETag."""
+        message = {"filename": "hashed_msg", "protocol": "test", "type": "Test", "data": {"v": 1}}
+        client.post("/api/messages", json=message)
+        first = client.get("/api/messages/hashed_msg.json").headers["etag"]
+        
+        client.post("/api/messages", json=message)
+        assert client.get("/api/messages/hashed_msg.json").headers["etag"] == first
+        
+        client.post("/api/messages", json={**message, "data": {"v": 2}})
+        assert client.get("/api/messages/hashed_msg.json").headers["etag"] != first
+        assert not first.startswith("W/")
+        
+        client.delete("/api/messages/hashed_msg.json")
+    
+    def test_oversize_save_rejected_before_parsing(self, client):
+        """Test that a body over the configured limit is refused with 413."""
+        from backend.core.config import config_manager
+        limit = config_manager.get().max_message_bytes
+        message = {"filename": "huge_msg", "protocol": "test", "type": "Test", "data": "x" * (limit + 1)}
+        response = client.post("/api/messages", json=message, headers={"origin": "http://localhost:5173"})
+        assert response.status_code == 413
+        # The frontend must be able to read the rejection, so it needs CORS headers too
+        assert response.headers["access-control-allow-origin"]
+        assert "huge_msg.json" not in client.get("/api/messages").json()
+    
+    def test_message_filename_traversal_rejected(self, client):
+        """Test that message filenames cannot escape the messages folder."""
+        assert client.get("/api/messages/..%5Cconfig.json").status_code == 400
+        assert client.delete("/api/messages/.hidden.json").status_code == 400
+        response = client.post("/api/messages", json={"filename": "../escape", "protocol": "test", "type": "Test", "data": {}})
+        assert response.status_code == 400
+    
     def test_clear_messages(self, client):
         """Test clearing all messages."""
         # Save some messages
@@ -142,10 +238,21 @@ class TestMessagesRouter:
                 "data": {}
             })
         
+        # A hidden file is not listed, so clearing must not delete it either
+        from backend.core.config import config_manager
+        hidden = os.path.join(config_manager.get_messages_path(), ".hidden_msg.json")
+        with open(hidden, 'w', encoding='utf-8') as f:
+            f.write("{}")
+        
         # Clear all
-        response = client.delete("/api/messages")
-        assert response.status_code == 200
-        assert response.json()["status"] == "success"
+        try:
+            response = client.delete("/api/messages")
+            assert response.status_code == 200
+            assert response.json()["status"] == "success"
+            assert client.get("/api/messages").json() == []
+            assert os.path.exists(hidden)
+        finally:
+            os.remove(hidden)
 
 
 class TestRRCStateMachine:
@@ -377,8 +484,191 @@ class TestScratchpadRouter:
         
         response = client.get("/api/scratchpad")
         assert response.json()["content"] == ""
+    
+    def test_save_scratchpad_as_plain_text(self, client):
+        """Test that a text/plain body is stored as the scratchpad content."""
+        test_content = "Streamed notes\nünïcode"
+        response = client.put("/api/scratchpad", content=test_content.encode("utf-8"),
+                              headers={"content-type": "text/plain; charset=utf-8"})
+        assert response.status_code == 200
+        assert client.get("/api/scratchpad").json()["content"] == test_content
+        
+        response = client.put("/api/scratchpad", content="Grüße".encode("latin-1"),
+                              headers={"content-type": "text/plain; charset=latin-1"})
+        assert response.status_code == 200
+        assert client.get("/api/scratchpad").json()["content"] == "Grüße"
+        
+        for body, content_type in [(b"\xff\xfe bad", "text/plain"), (b"x", "text/plain; charset=base64"),
+                                   (b"x", "text/plain; charset=no-such-charset")]:
+            response = client.put("/api/scratchpad", content=body, headers={"content-type": content_type})
+            assert response.status_code == 400
+        assert client.get("/api/scratchpad").json()["content"] == "Grüße"
+        
+        response = client.put("/api/scratchpad", json={"text": "wrong field"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "content"]
+    
+    def test_scratchpad_picks_up_external_edits(self, client):
+        """Test that the cached scratchpad is re-read once the file changes on disk."""
+        import os
+        from backend.routers.scratchpad import _get_scratchpad_path
+        
+        client.put("/api/scratchpad", json={"content": "Saved"})
+        filepath = _get_scratchpad_path()
+        assert not os.path.exists(filepath + ".tmp")
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write("Edited elsewhere")
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert client.get("/api/scratchpad").json()["content"] == "Edited elsewhere"
 
 
+class TestSessionsRouter:
+    """Tests for sessions router."""
+    
+    def test_list_skips_stray_entries(self, client):
+        """Test that files, hidden folders and incomplete sessions are not listed."""
+        from backend.routers.sessions import _get_sessions_path
+        
+        session_id = client.post("/api/sessions", json={"name": "Listed"}).json()["id"]
+        sessions_path = _get_sessions_path()
+        stray_file = os.path.join(sessions_path, "notes.txt")
+        hidden_dir = os.path.join(sessions_path, ".hidden")
+        with open(stray_file, 'w', encoding='utf-8') as f:
+            f.write("not a session")
+        os.makedirs(hidden_dir, exist_ok=True)
+        broken = {
+            "broken": '{"id": "broken"}',
+            "mistyped": '{"id": "mistyped", "name": "M", "created_at": null, "updated_at": "x"}',
+        }
+        for name, content in broken.items():
+            os.makedirs(os.path.join(sessions_path, name), exist_ok=True)
+            with open(os.path.join(sessions_path, name, "_session.json"), 'w', encoding='utf-8') as f:
+                f.write(content)
+        try:
+            response = client.get("/api/sessions")
+            assert response.status_code == 200
+            ids = [s["id"] for s in response.json()]
+            assert session_id in ids
+            assert not {"notes.txt", ".hidden", "broken", "mistyped"} & set(ids)
+        finally:
+            os.remove(stray_file)
+            os.rmdir(hidden_dir)
+            for name in broken:
+                os.remove(os.path.join(sessions_path, name, "_session.json"))
+                os.rmdir(os.path.join(sessions_path, name))
+            client.delete(f"/api/sessions/{session_id}")
+
+    
+    def test_list_reflects_updates_and_deletes(self, client):
+        """Test that the cached session listing follows renames and deletions."""
+        session = client.post("/api/sessions", json={"name": "Before"}).json()
+        assert session["created_at"] == session["updated_at"]
+        session_id = session["id"]
+        assert "Before" in [s["name"] for s in client.get("/api/sessions").json()]
+        
+        client.put(f"/api/sessions/{session_id}", json={"name": "After"})
+        names = {s["id"]: s["name"] for s in client.get("/api/sessions").json()}
+        assert names[session_id] == "After"
+        
+        client.delete(f"/api/sessions/{session_id}")
+        assert session_id not in [s["id"] for s in client.get("/api/sessions").json()]
+    
+    def test_session_message_round_trip(self, client):
+        """Test saving and reading back a session message, including a wide integer."""
+        session_id = client.post("/api/sessions", json={"name": "Messages"}).json()["id"]
+        try:
+            message = {"filename": "msg", "protocol": "rrc_demo", "type": "T", "data": {"big": 2**70, "text": "ü"}}
+            response = client.post(f"/api/sessions/{session_id}/messages", json=message)
+            assert response.json()["filename"] == "msg.json"
+            
+            response = client.get(f"/api/sessions/{session_id}/messages/msg.json")
+            assert response.status_code == 200
+            assert response.json() == message
+            assert response.headers["content-type"] == "application/json"
+            assert client.get(f"/api/sessions/{session_id}/messages/missing.json").status_code == 404
+            assert client.get(f"/api/sessions/{session_id}/messages").json() == ["msg.json"]
+            
+            assert client.delete(f"/api/sessions/{session_id}/messages").status_code == 200
+            assert client.get(f"/api/sessions/{session_id}/messages").json() == []
+        finally:
+            client.delete(f"/api/sessions/{session_id}")
+    
+    def test_missing_sessions_folder_gets_default(self, client, tmp_path, monkeypatch):
+        """Test that listing with no sessions folder yet creates the default session."""
+        from backend.core.config import config_manager
+        
+        monkeypatch.setattr(config_manager.config, "saved_messages_dir", str(tmp_path / "messages"))
+        assert client.get("/api/sessions/default").status_code == 404
+        assert not (tmp_path / "sessions").exists()
+        
+        sessions = client.get("/api/sessions").json()
+        assert [s["id"] for s in sessions] == ["default"]
+        assert (tmp_path / "sessions" / "default" / "_session.json").is_file()
+    
+    def test_writes_recreate_removed_folders(self, client):
+        """Test that session writes still work after the session folder is removed on disk."""
+        import shutil
+        from backend.routers.sessions import _get_session_path
+        
+        session_id = client.post("/api/sessions", json={"name": "Recreated"}).json()["id"]
+        try:
+            client.put(f"/api/sessions/{session_id}/scratchpad", json={"content": "first"})
+            shutil.rmtree(_get_session_path(session_id))
+            
+            assert client.put(f"/api/sessions/{session_id}/scratchpad", json={"content": "second"}).status_code == 200
+            assert client.get(f"/api/sessions/{session_id}/scratchpad").json()["content"] == "second"
+            response = client.post(f"/api/sessions/{session_id}/messages", json={"filename": "m", "data": {}})
+            assert response.status_code == 200
+        finally:
+            shutil.rmtree(_get_session_path(session_id), ignore_errors=True)
+    
+    def test_missing_session_files(self, client):
+        """Test reads and deletes of session files that do not exist."""
+        session_id = client.post("/api/sessions", json={"name": "Empty"}).json()["id"]
+        try:
+            assert client.get(f"/api/sessions/{session_id}/scratchpad").json() == {"content": ""}
+            assert client.delete(f"/api/sessions/{session_id}/messages/none.json").status_code == 200
+            assert client.delete(f"/api/sessions/{session_id}/messages").status_code == 200
+        finally:
+            client.delete(f"/api/sessions/{session_id}")
+        assert client.delete(f"/api/sessions/{session_id}").status_code == 404
+    
+    def test_clear_many_session_messages(self, client):
+        """Test clearing more messages than the serial-clear threshold."""
+        from backend.routers.sessions import _PARALLEL_CLEAR_MIN, _get_session_path
+        
+        session_id = client.post("/api/sessions", json={"name": "Many"}).json()["id"]
+        try:
+            messages_path = os.path.join(_get_session_path(session_id), "messages")
+            os.makedirs(messages_path, exist_ok=True)
+            for i in range(_PARALLEL_CLEAR_MIN + 10):
+                with open(os.path.join(messages_path, f"m{i}.json"), 'w', encoding='utf-8') as f:
+                    f.write("{}")
+            with open(os.path.join(messages_path, "keep.txt"), 'w', encoding='utf-8') as f:
+                f.write("not a message")
+            
+            assert client.delete(f"/api/sessions/{session_id}/messages").status_code == 200
+            assert os.listdir(messages_path) == ["keep.txt"]
+        finally:
+            client.delete(f"/api/sessions/{session_id}")
+    
+    def test_session_message_traversal_rejected(self, client):
+        """Test that session message filenames cannot escape the messages folder."""
+        session_id = client.post("/api/sessions", json={"name": "Guarded"}).json()["id"]
+        try:
+            base = f"/api/sessions/{session_id}/messages"
+            for filename in ["../_session", "..\\evil", ".hidden", ""]:
+                assert client.post(base, json={"filename": filename, "data": {}}).status_code == 400
+            assert client.post(base, json={"filename": 5}).status_code == 400
+            assert client.get(f"{base}/.hidden.json").status_code == 400
+            assert client.get(f"{base}/..%5C_session.json").status_code == 400
+            assert client.delete(f"{base}/..%5C_session.json").status_code == 400
+            assert client.get(f"/api/sessions/{session_id}").status_code == 200
+        finally:
+            client.delete(f"/api/sessions/{session_id}")
+
 class TestFilesRouter:
     """Additional tests for files router (44% -> target 70%)."""
     
@@ -396,6 +686,18 @@ class TestFilesRouter:
         response = client.get("/api/protocols/nonexistent_protocol_xyz/files")
         assert response.status_code == 404
     
+    def test_read_file_known_protocol(self, client):
+        """Test reading an existing .asn file returns its content."""
+        files = client.get("/api/protocols/rrc_demo/files").json()
+        response = client.get(f"/api/protocols/rrc_demo/files/{files[0]}")
+        assert response.status_code == 200
+        assert "DEFINITIONS" in response.json()["content"]
+    
+    def test_read_file_missing(self, client):
+        """Test reading a file that does not exist."""
+        response = client.get("/api/protocols/rrc_demo/files/missing.asn")
+        assert response.status_code == 404
+    
     def test_read_file_security(self, client):
         """Test that directory traversal is blocked."""
         # Attempt path traversal - should be blocked with 400 or 404
@@ -403,6 +705,22 @@ class TestFilesRouter:
         # Any of 400, 404, 422 is acceptable - just not 200 or 500
         assert response.status_code in [400, 404, 422]
     
+    def test_write_text_replaces_content(self, tmp_path):
+        """Test that saving a file truncates the previous, longer content."""
+        from backend.routers.files import _write_text, _read_text
+
+        target = tmp_path / "spec.asn"
+        target.write_text("Old DEFINITIONS ::= BEGIN -- long comment -- END\n", encoding="utf-8")
+        _write_text(str(target), "New DEFINITIONS ::= BEGIN END -- \u00e9\n")
+
+        assert _read_text(str(target)) == "New DEFINITIONS ::= BEGIN END -- \u00e9\n"
+    
+    def test_create_file_rejects_path_components(self, client):
+        """Test that separators and parent references in new filenames are rejected."""
+        for filename in ["..evil.asn", "sub\\evil.asn"]:
+            response = client.post("/api/protocols/rrc_demo/files", json={"filename": filename, "content": "x"})
+            assert response.status_code == 400
+    
     def test_create_file_invalid_extension(self, client):
         """Test that non-.asn files are rejected."""
         response = client.post("/api/protocols/rrc_demo/files", json={
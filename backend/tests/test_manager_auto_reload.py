@@ -43,3 +43,80 @@ def test_manager_detects_new_protocol_without_manual_reload(tmp_path, monkeypatc
     assert "beta" in protocols
     assert mgr.get_compiler("beta") is not None
 
+
+def test_manager_type_names_follow_reload(tmp_path, monkeypatch):
+    specs_root = tmp_path / "specs"
+    specs_root.mkdir()
+    _write_protocol(specs_root, "alpha")
+
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        AppConfig(specs_directories=[str(specs_root)]),
+        raising=False,
+    )
+
+    mgr = AsnManager()
+    assert mgr.get_type_names("alpha") == ("AlphaMessage",)
+    assert mgr.get_type_names("beta") == ()
+    assert mgr.get_sorted_type_names("beta") is None
+
+    _write_protocol(specs_root, "beta")
+    mgr._snapshot_interval = 0
+
+    assert mgr.get_type_names("beta") == ("BetaMessage",)
+    assert mgr.get_sorted_type_names("beta") == ("BetaMessage",)
+
+
+def test_file_map_follows_directory_changes(tmp_path, monkeypatch):
+    specs_root = tmp_path / "specs"
+    specs_root.mkdir()
+    proto_dir = _write_protocol(specs_root, "alpha")
+
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        AppConfig(specs_directories=[str(specs_root)]),
+        raising=False,
+    )
+
+    mgr = AsnManager()
+    assert mgr.get_file_map("alpha") == {"alpha.asn": str(proto_dir / "alpha.asn")}
+    assert mgr.get_file_map("missing") is None
+
+    (proto_dir / "example.json").write_text("{}")
+    mgr._snapshot_interval = 0
+
+    assert list(mgr.get_file_map("alpha")) == ["alpha.asn", "example.json"]
+
+
+def test_schedule_reload_coalesces_bursts(tmp_path, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(
+        config_manager,
+        "config",
+        AppConfig(specs_directories=[str(tmp_path)]),
+        raising=False,
+    )
+    mgr = AsnManager()
+    calls = []
+
+    def fake_reload():
+        calls.append(1)
+        return {"alpha": f"error {len(calls)}"}
+
+    monkeypatch.setattr(mgr, "reload", fake_reload)
+
+    async def burst():
+        first = asyncio.create_task(mgr.schedule_reload(debounce=0.05))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(mgr.schedule_reload(debounce=0.05))
+        return await asyncio.gather(first, second)
+
+    results = asyncio.run(burst())
+    assert calls == [1]
+    assert results == [{"alpha": "error 1"}, {"alpha": "error 1"}]
+
+    # A later edit gets its own reload
+    assert asyncio.run(mgr.schedule_reload(debounce=0)) == {"alpha": "error 2"}
@@ -214,6 +214,36 @@ class TestMscSequenceWorkflows:
         # Cleanup
         client.delete(f'/api/msc/sequences/{sequence_id}')
     
+    def test_sequence_response_uses_camel_case_keys(self, client):
+        """Test that sequence responses keep the camelCase schema."""
+        create_resp = client.post('/api/msc/sequences', json={
+            'name': 'Schema Test',
+            'protocol': 'rrc_demo'
+        })
+        sequence_id = create_resp.json()['id']
+        
+        msg_resp = client.post(f'/api/msc/sequences/{sequence_id}/messages', json={
+            'type_name': 'RRCConnectionRequest',
+            'data': {'ue-Identity': {'randomValue': '0x123'}},
+            'source_actor': 'UE',
+            'target_actor': 'gNB'
+        })
+        sequence = msg_resp.json()
+        assert {'id', 'name', 'protocol', 'sessionId', 'messages', 'subSequences', 'configurations',
+                'validationResults', 'createdAt', 'updatedAt'} == set(sequence)
+        message = sequence['messages'][0]
+        assert {'id', 'typeName', 'data', 'sourceActor', 'targetActor', 'timestamp',
+                'validationErrors'} == set(message)
+        for issue in message['validationErrors'] + sequence['validationResults']:
+            assert {'type', 'message', 'field', 'messageIndex', 'code'} == set(issue)
+        for identifier in sequence['configurations'].values():
+            assert {'name', 'values', 'isConsistent', 'conflicts'} == set(identifier)
+        
+        assert client.get(f'/api/msc/sequences/{sequence_id}').json() == sequence
+        
+        # Cleanup
+        client.delete(f'/api/msc/sequences/{sequence_id}')
+    
     def test_sequence_validation_workflow(self, client):
         """Test sequence validation."""
         # Create sequence with messages
@@ -242,6 +272,53 @@ class TestMscSequenceWorkflows:
         # Cleanup
         client.delete(f'/api/msc/sequences/{sequence_id}')
     
+    def test_sequence_conditional_get(self, client):
+        """Test that sequence GETs carry an ETag and answer 304 until the sequence changes."""
+        sequence_id = client.post('/api/msc/sequences', json={
+            'name': 'ETag Test',
+            'protocol': 'rrc_demo'
+        }).json()['id']
+        
+        first = client.get(f'/api/msc/sequences/{sequence_id}')
+        etag = first.headers['etag']
+        cached = client.get(f'/api/msc/sequences/{sequence_id}', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.content == b''
+        
+        client.put(f'/api/msc/sequences/{sequence_id}', json={'name': 'ETag Test Renamed'})
+        changed = client.get(f'/api/msc/sequences/{sequence_id}', headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.json()['name'] == 'ETag Test Renamed'
+        assert changed.headers['etag'] != etag
+        
+        listing = client.get('/api/msc/sequences')
+        assert client.get('/api/msc/sequences', headers={'If-None-Match': listing.headers['etag']}).status_code == 304
+        
+        # Cleanup
+        client.delete(f'/api/msc/sequences/{sequence_id}')
+    
+    def test_validation_counts(self, client):
+        """Test that validation reports error and warning counts alongside the issues."""
+        from unittest.mock import MagicMock
+        from backend.domain.msc.entities import ValidationResult, ValidationType
+        from backend.infrastructure.msc.dependencies import get_msc_service
+        
+        service = MagicMock()
+        service.validate_sequence.return_value = [
+            ValidationResult(type=ValidationType.ERROR, message='bad', message_index=0),
+            ValidationResult(type=ValidationType.WARNING, message='odd', field='f'),
+            ValidationResult(type=ValidationType.ERROR, message='worse', code='E2'),
+        ]
+        app.dependency_overrides[get_msc_service] = lambda: service
+        try:
+            validation = client.post('/api/msc/sequences/any/validate').json()
+        finally:
+            app.dependency_overrides.pop(get_msc_service)
+        
+        assert (validation['hasErrors'], validation['errorCount'], validation['warningCount']) == (True, 2, 1)
+        assert [r['type'] for r in validation['results']] == ['error', 'warning', 'error']
+        assert validation['results'][0]['messageIndex'] == 0
+    
     def test_list_sequences_workflow(self, client):
         """Test listing sequences."""
         # Create multiple sequences
@@ -265,6 +342,60 @@ class TestMscSequenceWorkflows:
         for seq_id in ids:
             client.delete(f'/api/msc/sequences/{seq_id}')
     
+    def test_list_sequences_includes_examples(self, client, tmp_path, monkeypatch):
+        """Test that example sequences are listed and reloaded when example files change."""
+        import json
+        import os
+        from backend.routers import msc
+        
+        monkeypatch.setattr(msc, '_EXAMPLE_DIR', tmp_path)
+        example_file = tmp_path / 'example_attach.json'
+        example = {
+            'id': 'example-attach',
+            'name': 'Attach',
+            'protocol': 'example_proto',
+            'messages': [{'id': 'm1', 'type_name': 'RRCSetupRequest', 'data': {},
+                          'validation_errors': [{'type': 'warning', 'message': 'check'}]}],
+            'created_at': '2025-03-04T05:06:07',
+            'tracked_identifiers': {'ue-Identity': {'values': {'0': 5}}},
+        }
+        example_file.write_text(json.dumps(example), encoding='utf-8')
+        
+        params = {'protocol': 'example_proto', 'include_examples': True}
+        sequences = client.get('/api/msc/sequences', params=params).json()
+        assert [s['name'] for s in sequences] == ['Attach']
+        assert sequences[0]['configurations']['ue-Identity']['values'] == {'0': 5}
+        assert sequences[0]['messages'][0]['validationErrors'][0]['type'] == 'warning'
+        assert sequences[0]['createdAt'] == '2025-03-04T05:06:07'
+        assert client.get('/api/msc/sequences', params={**params, 'protocol': 'other'}).json() == []
+        assert client.get('/api/msc/examples/attach').json() == sequences[0]
+        assert client.get('/api/msc/examples/missing').status_code == 404
+        
+        # Replace the file the way editors save, and make sure both mtimes move on
+        replacement = tmp_path / 'attach.tmp'
+        replacement.write_text(json.dumps({**example, 'name': 'Attach v2'}), encoding='utf-8')
+        os.replace(replacement, example_file)
+        for path in (example_file, tmp_path):
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        sequences = client.get('/api/msc/sequences', params=params).json()
+        assert [s['name'] for s in sequences] == ['Attach v2']
+        
+        # An in-place save leaves the folder mtime alone; both endpoints still see it
+        example_file.write_text(json.dumps({**example, 'name': 'Attach v3'}), encoding='utf-8')
+        stat = example_file.stat()
+        os.utime(example_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        sequences = client.get('/api/msc/sequences', params=params).json()
+        assert [s['name'] for s in sequences] == ['Attach v3']
+        assert client.get('/api/msc/examples/attach').json() == sequences[0]
+        
+        (tmp_path / 'example_detach.json').write_text(
+            json.dumps({**example, 'id': 'example-detach', 'name': 'Detach'}), encoding='utf-8')
+        stat = tmp_path.stat()
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        sequences = client.get('/api/msc/sequences', params=params).json()
+        assert [s['name'] for s in sequences] == ['Attach v3', 'Detach']
+    
     def test_export_import_workflow(self, client):
         """Test exporting and importing a sequence."""
         # Create and populate a sequence
@@ -371,6 +502,10 @@ class TestMscSessionWorkflows:
         client.delete(f'/api/msc/sessions/{session_id}')
 
 
+def _fail_in_process_decode(*args):
+    raise AssertionError("batch was decoded in-process instead of in the worker pool")
+
+
 class TestMscHexDecodeWorkflow:
     """Tests for hex decoding workflow."""
     
@@ -390,6 +525,120 @@ class TestMscHexDecodeWorkflow:
         if response.status_code == 200:
             data = response.json()
             assert 'status' in data
+    
+    def test_decode_hex_sets_known_message_direction(self, client):
+        """Test that known uplink messages get UE -> gNB regardless of the requested actors."""
+        response = client.post('/api/msc/decode-hex', json={
+            'hex_data': '80123456789060',
+            'protocol': 'rrc_demo',
+            'type_name': 'RRCConnectionRequest',
+            'source_actor': 'gNB',
+            'target_actor': 'UE'
+        })
+        data = response.json()
+        assert data['status'] == 'success'
+        assert (data['sourceActor'], data['targetActor']) == ('UE', 'gNB')
+    
+    def test_decode_hex_batch(self, client):
+        """Test that a batch reports one result per message, in order."""
+        response = client.post('/api/msc/decode-hex-batch', json={
+            'hex_messages': ['0x80, 0x12, 0x34, 0x56,\n0x78, 0x90, 0x60', 'zz'],
+            'protocol': 'rrc_demo',
+            'type_name': 'RRCConnectionRequest'
+        })
+        assert response.status_code == 200
+        results = response.json()
+        assert [r['status'] for r in results] == ['success', 'error']
+        assert results[0]['typeName'] == 'RRCConnectionRequest'
+        assert results[0]['hex'] == '80123456789060'
+        assert 'Invalid hex format' in results[1]['error']
+        
+        response = client.post('/api/msc/decode-hex-batch', json={
+            'hex_messages': ['8012', '8034'],
+            'protocol': 'missing_protocol'
+        })
+        assert [r['error'] for r in response.json()] == ["Protocol 'missing_protocol' not found"] * 2
+    
+    def test_decode_hex_batch_in_worker_processes(self, client, monkeypatch):
+        """Test that large batches decoded in worker processes keep their order."""
+        from backend.routers import msc
+        
+        monkeypatch.setattr(msc, '_DECODE_WORKERS', 1)
+        monkeypatch.setattr(msc, '_PARALLEL_BATCH_MIN', 2)
+        monkeypatch.setattr(msc, '_BATCH_CHUNK_SIZE', 2)
+        monkeypatch.setattr(msc, '_decode_pool', None)
+        monkeypatch.setattr(msc, '_decode_batch', _fail_in_process_decode)
+        try:
+            response = client.post('/api/msc/decode-hex-batch', json={
+                'hex_messages': ['80123456789060', 'zz', '80123456789060'],
+                'protocol': 'rrc_demo',
+                'type_name': 'RRCConnectionRequest'
+            })
+        finally:
+            msc.shutdown_decode_pool()
+        assert [r['status'] for r in response.json()] == ['success', 'error', 'success']
+    
+    def test_decode_hex_batch_workers_follow_schema_edits(self, client, monkeypatch, tmp_path):
+        """Test that worker processes decode with the schema saved through the files API."""
+        import json
+        from backend.core import manager as manager_module
+        from backend.core.config import AppConfig, config_manager
+        from backend.routers import files, msc
+        
+        specs = tmp_path / "specs"
+        (specs / "edit_demo").mkdir(parents=True)
+        schema = "EditDemo DEFINITIONS AUTOMATIC TAGS ::= BEGIN\nMsg ::= SEQUENCE {{ {} INTEGER (0..255) }}\nEND\n"
+        (specs / "edit_demo" / "edit.asn").write_text(schema.format("first"))
+        
+        # Workers compile from the files the manager reports, so only this process needs the config
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"specs_directories": [str(specs)]}))
+        monkeypatch.setattr(config_manager, "config_file", str(config_file))
+        monkeypatch.setattr(config_manager, "config", AppConfig(specs_directories=[str(specs)]))
+        test_manager = manager_module.AsnManager()
+        monkeypatch.setattr(manager_module, "manager", test_manager)
+        monkeypatch.setattr(files, "manager", test_manager)
+        
+        monkeypatch.setattr(msc, '_DECODE_WORKERS', 1)
+        monkeypatch.setattr(msc, '_PARALLEL_BATCH_MIN', 2)
+        monkeypatch.setattr(msc, '_BATCH_CHUNK_SIZE', 1)
+        monkeypatch.setattr(msc, '_decode_pool', None)
+        monkeypatch.setattr(msc, '_decode_batch', _fail_in_process_decode)
+        batch = {'hex_messages': ['05', '07'], 'protocol': 'edit_demo', 'type_name': 'Msg'}
+        try:
+            results = client.post('/api/msc/decode-hex-batch', json=batch).json()
+            assert [r['data'] for r in results] == [{'first': 5}, {'first': 7}]
+            pool = msc._decode_pool
+            
+            response = client.put('/api/protocols/edit_demo/files/edit.asn', json={'content': schema.format("second")})
+            assert response.json()['status'] == 'success'
+            results = client.post('/api/msc/decode-hex-batch', json=batch).json()
+            assert [r['data'] for r in results] == [{'second': 5}, {'second': 7}]
+            # The pool outlives the reload; its worker recompiled only the edited protocol
+            assert msc._decode_pool is pool
+        finally:
+            msc.shutdown_decode_pool()
+    
+    def test_decode_chunk_compiles_only_its_protocol(self, monkeypatch):
+        """Test that a worker compiles the chunk's protocol once per manager generation."""
+        from backend.core.manager import manager
+        from backend.routers import msc
+        
+        monkeypatch.setattr(msc, '_worker_compilers', {})
+        files = manager.get_source_files('simple_demo')
+        compile_calls = []
+        real_compile = msc.asn1tools.compile_files
+        
+        def counting_compile(*args, **kwargs):
+            compile_calls.append(args)
+            return real_compile(*args, **kwargs)
+        monkeypatch.setattr(msc.asn1tools, 'compile_files', counting_compile)
+        
+        for generation in (1, 1, 2):
+            results = msc._decode_chunk('simple_demo', generation, files, ('Person',), 'Person', ['8200416c6963653c'])
+            assert results[0].data == {'name': 'Alice', 'age': 30, 'isAlive': True}
+        assert len(compile_calls) == 2
+        assert list(msc._worker_compilers) == ['simple_demo']
 
 
 class TestMscEdgeCases:
@@ -0,0 +1,35 @@
+import json
+
+from backend.core.responses import FastJSONResponse, parse_json, render_json
+
+
+def test_renders_compact_json():
+    response = FastJSONResponse({"status": "success", "data": {"octets": "dead", "items": [1, None]}})
+
+    assert json.loads(response.body) == {"status": "success", "data": {"octets": "dead", "items": [1, None]}}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_wide_integers_fall_back_to_stdlib():
+    value = 2 ** 80
+
+    response = FastJSONResponse({"value": value})
+
+    assert json.loads(response.body) == {"value": value}
+
+
+def test_indented_render_round_trips():
+    content = {"protocol": "rrc_demo", "data": {"name": "é", "value": 2 ** 70}}
+
+    raw = render_json(content, indent=True)
+
+    assert b"\n  " in raw
+    assert parse_json(raw) == content
+
+
+def test_sorted_compact_render():
+    assert render_json({"b": 1, "a": [2, 3]}, sort_keys=True) == b'{"a":[2,3],"b":1}'
+
+
+def test_integer_keys_render_as_strings():
+    assert render_json({0: "first", 1: None}) == b'{"0":"first","1":null}'
@@ -0,0 +1,112 @@
+import pytest
+
+from backend.core.serialization import (
+    _extract_choice,
+    deserialize_asn1_data,
+    hex_to_bytes,
+    serialize_asn1_data,
+    strip_hex,
+)
+
+
+def test_extract_choice_notations():
+    assert _extract_choice({"$choice": "a", "value": 1}) == ("a", 1)
+    assert _extract_choice({"choice": "b", "value": 2}) == ("b", 2)
+    assert _extract_choice({"value": 3, "marker": "c"}) == ("c", 3)
+    assert _extract_choice({"value": 3, "marker": "  "}) is None
+    assert _extract_choice({"value": 3, "x": "a", "y": "b"}) is None
+    assert _extract_choice({"name": "Alice"}) is None
+    assert _extract_choice({}) is None
+
+
+def test_deserialize_special_formats():
+    payload = {
+        "raw": {"$hex": "dead"},
+        "prefixed": "0xbeef",
+        "bits": ["0xa0", 3],
+        "pick": {"$choice": "opt", "value": {"inner": "0x01"}},
+        "items": [{"$hex": "00"}, "plain", 7],
+        "text": "hello",
+    }
+
+    assert deserialize_asn1_data(payload) == {
+        "raw": b"\xde\xad",
+        "prefixed": b"\xbe\xef",
+        "bits": (b"\xa0", 3),
+        "pick": ("opt", {"inner": b"\x01"}),
+        "items": [b"\x00", "plain", 7],
+        "text": "hello",
+    }
+
+
+def test_serialize_decoded_values():
+    decoded = {
+        "octets": b"\xde\xad",
+        "bits": (b"\xa0", 3),
+        "pick": ("opt", {"inner": bytearray(b"\x01")}),
+        "seq": [("a", 1), 2],
+        "tuple": (1, 2, 3),
+        "name": "Alice",
+    }
+
+    assert serialize_asn1_data(decoded) == {
+        "octets": "dead",
+        "bits": ["0xa0", 3],
+        "pick": {"$choice": "opt", "value": {"inner": "01"}},
+        "seq": [{"$choice": "a", "value": 1}, 2],
+        "tuple": [1, 2, 3],
+        "name": "Alice",
+    }
+
+
+def test_serialize_deserialize_roundtrip_choice():
+    decoded = ("opt", {"flags": (b"\xa0", 3), "count": 5})
+
+    assert deserialize_asn1_data(serialize_asn1_data(decoded)) == decoded
+
+
+def test_deeply_nested_payload_exceeds_recursion_limit():
+    import sys
+
+    depth = sys.getrecursionlimit() + 100
+    payload = "0xff"
+    for _ in range(depth):
+        payload = {"$choice": "next", "value": [payload]}
+
+    node = deserialize_asn1_data(payload)
+    for _ in range(depth):
+        assert node[0] == "next"
+        node = node[1][0]
+    assert node == b"\xff"
+
+    node = serialize_asn1_data(deserialize_asn1_data(payload))
+    for _ in range(depth):
+        assert node["$choice"] == "next"
+        node = node["value"][0]
+    assert node == "ff"
+
+
+def test_hex_to_bytes_accepts_prefixes_and_whitespace():
+    assert hex_to_bytes("dead beef") == b"\xde\xad\xbe\xef"
+    assert hex_to_bytes("0xde 0xad\n0xbe0xef") == b"\xde\xad\xbe\xef"
+    assert hex_to_bytes("d ead\nbeef") == b"\xde\xad\xbe\xef"
+    assert hex_to_bytes("") == b""
+
+
+def test_hex_to_bytes_rejects_invalid_input():
+    with pytest.raises(ValueError):
+        hex_to_bytes("xyz")
+
+
+def test_strip_hex_removes_prefixes_and_all_whitespace():
+    assert strip_hex("0xde ad\n\tbe\r\nef") == "deadbeef"
+    assert strip_hex("cafe") == "cafe"
+
+
+def test_primitive_payloads_returned_unchanged():
+    payload = {"name": "Alice", "items": [1, "two", {"flag": True}], "value_only": {"value": 1, "n": 2, "m": 3}}
+
+    assert deserialize_asn1_data(payload) is payload
+    assert serialize_asn1_data(payload) is payload
+    assert deserialize_asn1_data({"nested": [{"raw": "0x01"}]}) == {"nested": [{"raw": b"\x01"}]}
+    assert serialize_asn1_data({"nested": [{"raw": b"\x01"}]}) == {"nested": [{"raw": "01"}]}
@@ -86,3 +86,15 @@ def test_trace_choice_direction(trace_service: TraceService):
     downlink_node = _find_child(result.root, "downlink")
     assert downlink_node is None
 
+
+
+def test_trace_results_are_not_shared(trace_service: TraceService):
+    hex_data = _encode_hex("simple_demo", "Person", {"name": "Eve", "age": 7, "isAlive": True})
+
+    first = trace_service.trace("simple_demo", "Person", hex_data)
+    first.root.children.clear()
+    second = trace_service.trace("simple_demo", "Person", hex_data)
+
+    # Each call builds its own tree, so one caller's edits never leak into another's
+    assert second.root is not first.root
+    assert second.root.children